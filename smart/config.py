@@ -354,6 +354,10 @@ class SolverConfig(BaseConfig):
         dt_increase_factor:
         attempt_timestep_restart_on_divergence: Restart snes solver if it diverges
         reset_timestep_for_negative_solution: Reduce solver timestep is solution is negative
+        form_compiler_parameters: Extra parameters passed to the form compiler when
+            compiling the residual and Jacobian forms, e.g.
+            :code:`{"cpp_optimize": True, "cpp_optimize_flags": "-O3 -march=native"}`.
+            If `None`, the global dolfin parameters are used
     """
 
     final_t: Optional[float] = None
@@ -364,6 +368,7 @@ class SolverConfig(BaseConfig):
     time_precision: int = 6
     attempt_timestep_restart_on_divergence: bool = False
     reset_timestep_for_negative_solution: bool = False
+    form_compiler_parameters: Optional[Dict[str, Any]] = None
 
 
 @dataclass
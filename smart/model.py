@@ -1,9 +1,12 @@
 """Functions associated with the SMART model class
 """
 import pickle
+from copy import deepcopy
+from collections import Counter
 from collections import OrderedDict as odict
 from dataclasses import dataclass
 from decimal import Decimal
+from functools import partial
 from itertools import chain
 import logging
 
@@ -17,16 +20,17 @@ from cached_property import cached_property
 from sympy.parsing.sympy_parser import parse_expr
 from tabulate import tabulate
 from scipy import integrate
+from scipy.spatial import cKDTree
 from sympy.utilities.lambdify import lambdify
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
 try:
     from ufl_legacy.algorithms.ad import expand_derivatives
-    from ufl_legacy.form import sub_forms_by_domain
+    from ufl_legacy.form import Form as UFLForm, sub_forms_by_domain
 except ImportError:
     from ufl.algorithms.ad import expand_derivatives
-    from ufl.form import sub_forms_by_domain
+    from ufl.form import Form as UFLForm, sub_forms_by_domain
 
 from .common import Stopwatch, sub
 from .config import Config
@@ -54,6 +58,48 @@ from .units import unit
 
 logger = logging.getLogger(__name__)
 
+# Timers created for every model
+_STOPWATCH_NAMES = (
+    "Total time step",
+    "Total simulation",
+    "loading mesh",
+    "Total initialization",
+    "snes all",
+    "snes total solve",
+    "snes total assemble",
+    "snes jacobian assemble",
+    "snes residual assemble",
+    "snes initialize zero matrices",
+)
+# nicer printing for timers
+_STOPWATCH_PRINT_BUFFER = max(map(len, _STOPWATCH_NAMES))
+# Names reserved for spatial coordinates, time and unit scaling in expressions
+_PROTECTED_NAMES = frozenset({"x[0]", "x[1]", "x[2]", "t", "unit_scale_factor"})
+# Time-step scaling factor indexed by the number of non-linear iterations of the
+# last step (0.5 for more than 20 iterations)
+_DT_SCALE_BY_NL_ITS = (1.1,) * 2 + (1.05,) * 3 + (1.0,) * 6 + (0.8,) * 10
+
+
+def _dt_scale(nl_its):
+    """Factor to scale the time step by after a step that took `nl_its` non-linear iterations"""
+    return _DT_SCALE_BY_NL_ITS[nl_its] if nl_its < len(_DT_SCALE_BY_NL_ITS) else 0.5
+
+
+def _bracketing_time_indices(tVec, t):
+    """Indices of the entries of the sorted times `tVec` before and after `t`.
+    Both indices are the same if `t` matches an entry of `tVec` or lies outside of it"""
+    # tVec is sorted, so only the entries either side of the insertion point
+    # of t can match it or bracket it
+    k = int(np.searchsorted(tVec, t))
+    for i in (k - 1, k):
+        if 0 <= i < len(tVec) and np.isclose(tVec[i], t):
+            return i, i
+    if k == 0:
+        return 0, 0
+    if k == len(tVec):
+        return k - 1, k - 1
+    return k - 1, k
+
 
 @dataclass
 class Model:
@@ -123,7 +169,7 @@ class Model:
     def to_pickle(self, filename):
         """Save model information to file by pickling"""
         with open(filename, "wb") as f:
-            pickle.dump(self.to_dict(), f)
+            pickle.dump(self.to_dict(), f, protocol=pickle.HIGHEST_PROTOCOL)
 
     @classmethod
     def from_pickle(cls, filename):
@@ -149,30 +195,17 @@ class Model:
         self.reset_dt = False
 
         self._failed_to_converge = False
+        # (Fsum, d.extract_blocks(Fsum)) for the most recently split form
+        self._extracted_blocks = (None, None)
         # idx, idx_nl, idx_l, t, dt, residuals, reason
         self.failed_solves = list()
         # list of dicts
         self.residuals = list()
 
         # Timers
-        stopwatch_names = [
-            "Total time step",
-            "Total simulation",
-            "loading mesh",
-            "Total initialization",
-            "snes all",
-            "snes total solve",
-            "snes total assemble",
-            "snes jacobian assemble",
-            "snes residual assemble",
-            "snes initialize zero matrices",
-        ]
-
-        # nicer printing for timers
-        print_buffer = max([len(stopwatch_name) for stopwatch_name in stopwatch_names])
         self.stopwatches = {
-            stopwatch_name: Stopwatch(stopwatch_name, print_buffer=print_buffer)
-            for stopwatch_name in stopwatch_names
+            stopwatch_name: Stopwatch(stopwatch_name, print_buffer=_STOPWATCH_PRINT_BUFFER)
+            for stopwatch_name in _STOPWATCH_NAMES
         }
 
         # Functional forms
@@ -186,8 +219,10 @@ class Model:
 
         if self.mpi_size > 1:
             logger.info(
-                f"CPU {self.mpi_rank}: Model '{self.name}' "
-                f"has been parallelized (size={self.mpi_size}).",
+                "CPU %s: Model '%s' has been parallelized (size=%s).",
+                self.mpi_rank,
+                self.name,
+                self.mpi_size,
                 extra=dict(format_type="log_urgent"),
             )
 
@@ -204,21 +239,41 @@ class Model:
         """Returns all child meshes in current parent mesh"""
         return self.parent_mesh.child_meshes
 
+    @cached_property
+    def _dim_minmax(self):
+        """Minimum and maximum compartment dimension in current model, computed together
+        (cached like min_dim and max_dim, which read it)"""
+        dims, _ = self.cc.get_dims_and_markers()
+        return int(dims.min()), int(dims.max())
+
     @cached_property
     def min_dim(self):
         """Returns minimum dimension in current model"""
-        dim = min([comp.dimensionality for comp in self.cc])
+        dim = self._dim_minmax[0]
         self.parent_mesh.min_dim = dim
         return dim
 
     @cached_property
     def max_dim(self):
         """Returns maximum dimension in current model"""
-        dim = max([comp.dimensionality for comp in self.cc])
-        self.max_dim = dim
+        dim = self._dim_minmax[1]
         self.parent_mesh.max_dim = dim
         return dim
 
+    @cached_property
+    def _mesh_by_id(self):
+        """Parent and child meshes keyed by mesh id"""
+        return {mesh.id: mesh for mesh in self.parent_mesh.all_meshes.values()}
+
+    @cached_property
+    def _time_dependent_parameters(self):
+        """(name, parameter) pairs of parameters that are updated every time-step"""
+        return [
+            (name, parameter)
+            for name, parameter in self.pc.items
+            if parameter.type == ParameterType.from_xdmf or parameter.is_time_dependent
+        ]
+
     @timed("Initialize Model")
     def initialize(self, initialize_solver=True):
         """Main model initialization function, split into 5 subfunctions"""
@@ -232,6 +287,9 @@ class Model:
 
         self.T = d.Constant(self.t, name="t")
         self.dT = d.Constant(self.dt, name="dT")
+        self._dT_value = self.dt  # last value assigned to self.dT
+        # time at the start of the current step (one step back before time-stepping starts)
+        self.Tn = d.Constant(self.t - self.dt, name="tn")
         self.tvec = [self.t]
         self.dtvec = [self.dt]
 
@@ -273,6 +331,7 @@ class Model:
                 format_type="title",
             ),
         )
+        self._cache_container_keys()
         self._init_2_1_reactions_to_symbolic_strings()
         self._init_2_2_check_reaction_validity()
         self._init_2_3_link_reaction_properties()
@@ -381,40 +440,34 @@ class Model:
         * no compartment has a marker value of 0
         """
         logger.debug("Checking for namespace conflicts", extra=dict(format_type="log"))
-        self._all_keys = set()
-        containers = [self.pc, self.sc, self.cc, self.rc]
-        for keys in [c.keys for c in containers]:
-            self._all_keys = self._all_keys.union(keys)
-        if sum([c.size for c in containers]) != len(self._all_keys):
+        name_counts = Counter(
+            chain.from_iterable(c.keys for c in [self.pc, self.sc, self.cc, self.rc])
+        )
+        self._all_keys = frozenset(name_counts)
+        duplicate_names = [name for name, count in name_counts.items() if count > 1]
+        if duplicate_names:
             raise ValueError(
-                "Model has a namespace conflict. There are "
-                "two parameters/species/compartments/reactions with the same name."
+                "Model has a namespace conflict. There are two "
+                f"parameters/species/compartments/reactions with the same name: {duplicate_names}"
             )
 
-        protected_names = {"x[0]", "x[1]", "x[2]", "t", "unit_scale_factor"}
         # Protect the variable names 'x[0]', 'x[1]', 'x[2]' and 't' because they are
         # used for spatial dimensions and time
-        if not protected_names.isdisjoint(self._all_keys):
+        protected_names_used = _PROTECTED_NAMES & self._all_keys
+        if protected_names_used:
             raise ValueError(
-                "An object is using a protected variable name "
+                f"An object is using a protected variable name {protected_names_used} "
                 "('x[0]', 'x[1]', 'x[2]', 't', or 'unit_scale_factor'). Please change the name."
             )
 
         # Make sure there are no overlapping markers or markers with value 0
-        self._all_markers = set()
-        for compartment in self.cc.values:
-            if isinstance(compartment.cell_marker, list):
-                marker_list = compartment.cell_marker
-            else:
-                marker_list = [compartment.cell_marker]
-
-            for marker in marker_list:
-                if marker in self._all_markers:
-                    raise ValueError(f"Two compartments have the same marker: {marker}")
-                elif marker == 0:
-                    raise ValueError("Marker cannot have the value 0")
-                else:
-                    self._all_markers.add(marker)
+        _, markers = self.cc.get_dims_and_markers()
+        markers, counts = np.unique(markers, return_counts=True)
+        if (counts > 1).any():
+            raise ValueError(f"Two compartments have the same marker: {markers[counts > 1][0]}")
+        if (markers == 0).any():
+            raise ValueError("Marker cannot have the value 0")
+        self._all_markers = set(markers.tolist())
 
     def _init_1_3_check_parameter_dimensionality(self):
         """Check no objects reference a higher spatial dimension than max_dim"""
@@ -431,6 +484,13 @@ class Model:
 
     # Step 2 - Cross-container Dependent Initialization
 
+    def _cache_container_keys(self):
+        """Store the parameter/species/compartment names as frozensets so the
+        cross-container checks do not rebuild them for every comparison"""
+        self._pc_key_set = frozenset(self.pc.keys)
+        self._sc_key_set = frozenset(self.sc.keys)
+        self._cc_key_set = frozenset(self.cc.keys)
+
     def _init_2_1_reactions_to_symbolic_strings(self):
         """Turn all reactions into unsigned symbolic flux strings"""
         logger.debug(
@@ -441,20 +501,14 @@ class Model:
         for reaction in self.rc:
             # Mass action has a forward and reverse flux
             if reaction.reaction_type == "mass_action":
-                reaction.eqn_f_str = reaction.param_map["on"]
-                for sp_name in reaction.lhs:
-                    reaction.eqn_f_str += "*" + sp_name
+                reaction.eqn_f_str = "*".join([reaction.param_map["on"], *reaction.lhs])
                 # rxn.eqn_f = parse_expr(rxn_sym_str)
 
-                reaction.eqn_r_str = reaction.param_map["off"]
-                for sp_name in reaction.rhs:
-                    reaction.eqn_r_str += "*" + sp_name
+                reaction.eqn_r_str = "*".join([reaction.param_map["off"], *reaction.rhs])
                 # rxn.eqn_r = parse_expr(rxn_sym_str)
 
             elif reaction.reaction_type == "mass_action_forward":
-                reaction.eqn_f_str = reaction.param_map["on"]
-                for sp_name in reaction.lhs:
-                    reaction.eqn_f_str += "*" + sp_name
+                reaction.eqn_f_str = "*".join([reaction.param_map["on"], *reaction.lhs])
                 # reaction.eqn_f = parse_expr(rxn_sym_str)
 
             # Custom reaction
@@ -480,6 +534,8 @@ class Model:
                 reaction.eqn_str = f"{reaction.eqn_f_str}"
             else:
                 reaction.eqn_str = f"{reaction.eqn_f_str}-{reaction.eqn_r_str}"
+            # parse once here; reused when checking validity and creating fluxes
+            reaction._parse_equations()
 
     def _init_2_2_check_reaction_validity(self):
         """Confirms that all reactions have parameters/species defined"""
@@ -488,28 +544,14 @@ class Model:
             extra=dict(format_type="log"),
         )
         # Make sure all reactions have parameters/species defined
+        known = self._pc_key_set | self._sc_key_set | {"curv"}
         for reaction in self.rc:
-            for eqn_str in [reaction.eqn_f_str, reaction.eqn_r_str]:
-                if not eqn_str:
-                    continue
-                eqn = parse_expr(eqn_str)
-                var_set = {str(x) for x in eqn.free_symbols}
-                param_set = var_set.intersection(self.pc.keys)
-                species_set = var_set.intersection(self.sc.keys)
-                if "curv" in var_set:
-                    if len(param_set) + len(species_set) + 1 != len(var_set):
-                        diff_set = var_set.difference(param_set.union(species_set))
-                        raise NameError(
-                            f"Reaction {reaction.name} refers to a parameter or "
-                            f"species ({diff_set}) that is not in the model."
-                        )
-                else:
-                    if len(param_set) + len(species_set) != len(var_set):
-                        diff_set = var_set.difference(param_set.union(species_set))
-                        raise NameError(
-                            f"Reaction {reaction.name} refers to a parameter or "
-                            f"species ({diff_set}) that is not in the model."
-                        )
+            diff_set = reaction._free_symbols - known
+            if diff_set:
+                raise NameError(
+                    f"Reaction {reaction.name} refers to a parameter or "
+                    f"species ({diff_set}) that is not in the model."
+                )
 
     def _init_2_3_link_reaction_properties(self):
         """Link parameters, species, and compartments to reactions"""
@@ -518,25 +560,26 @@ class Model:
             extra=dict(format_type="log"),
         )
 
+        # Aliases
+        pc, sc, cc = self.pc, self.sc, self.cc
+
         for reaction in self.rc:
             reaction.parameters = {
-                param_name: self.pc[param_name] for param_name in reaction.param_map.values()
+                param_name: pc[param_name] for param_name in reaction.param_map.values()
             }
             reaction.species = {
-                species_name: self.sc[species_name]
-                for species_name in reaction.species_map.values()
+                species_name: sc[species_name] for species_name in reaction.species_map.values()
             }
             compartment_names = [species.compartment_name for species in reaction.species.values()]
             if reaction.explicit_restriction_to_domain:
                 compartment_names.append(reaction.explicit_restriction_to_domain)
             reaction.compartments = {
-                compartment_name: self.cc[compartment_name]
-                for compartment_name in compartment_names
+                compartment_name: cc[compartment_name] for compartment_name in compartment_names
             }
             # number of parameters, species, and compartments
             reaction.num_species = len(reaction.species)
 
-            is_volume = [c.is_volume for c in reaction.compartments.values()]
+            is_volume = tuple(c.is_volume for c in reaction.compartments.values())
             if len(is_volume) == 1:
                 if is_volume[0]:
                     reaction.topology = "volume"
@@ -582,54 +625,34 @@ class Model:
             extra=dict(format_type="log"),
         )
 
-        all_parameters = set(chain.from_iterable([r.parameters for r in self.rc]))
-        all_species = set(chain.from_iterable([r.species for r in self.rc]))
-        all_compartments = set(chain.from_iterable([r.compartments for r in self.rc]))
-        if all_parameters != set(self.pc.keys):
-            print_str = (
-                f"Parameter(s), {set(self.pc.keys).difference(all_parameters)}, "
-                "are unused in any reactions."
-            )
-            if self.config.flags["allow_unused_components"]:
-                for parameter in set(self.pc.keys).difference(all_parameters):
-                    self.pc.remove(parameter)
-                logger.info(print_str, extra=dict(format_type="log_urgent"))
-                logger.info(
-                    "Removing unused parameter(s) from model!",
-                    extra=dict(format_type="log_urgent"),
-                )
-            else:
-                raise ValueError(print_str)
-        if all_species != set(self.sc.keys):
-            print_str = (
-                f"Species, {set(self.sc.keys).difference(all_species)}, "
-                "are unused in any reactions."
-            )
-            if self.config.flags["allow_unused_components"]:
-                for species in set(self.sc.keys).difference(all_species):
-                    self.sc.remove(species)
-                logger.info(print_str, extra=dict(format_type="log_urgent"))
-                logger.info(
-                    "Removing unused species(s) from model!",
-                    extra=dict(format_type="log_urgent"),
-                )
-            else:
-                raise ValueError(print_str)
-        if all_compartments != set(self.cc.keys):
-            print_str = (
-                f"Compartment(s), {set(self.cc.keys).difference(all_compartments)}, "
-                "are unused in any reactions."
-            )
-            if self.config.flags["allow_unused_components"]:
-                for compartment in set(self.cc.keys).difference(all_compartments):
-                    self.cc.remove(compartment)
-                logger.info(print_str, extra=dict(format_type="log_urgent"))
-                logger.info(
-                    "Removing unused compartment(s) from model!",
-                    extra=dict(format_type="log_urgent"),
-                )
-            else:
-                raise ValueError(print_str)
+        all_parameters = frozenset().union(*(r.parameters.keys() for r in self.rc))
+        all_species = frozenset().union(*(r.species.keys() for r in self.rc))
+        all_compartments = frozenset().union(*(r.compartments.keys() for r in self.rc))
+        unused = {
+            "Parameter(s)": (self.pc, self._pc_key_set - all_parameters),
+            "Species": (self.sc, self._sc_key_set - all_species),
+            "Compartment(s)": (self.cc, self._cc_key_set - all_compartments),
+        }
+        # Report everything that is unused at once rather than one container at a time
+        print_str = " ".join(
+            f"{label}, {names}, are unused in any reactions."
+            for label, (_, names) in unused.items()
+            if names
+        )
+        if not print_str:
+            return
+        if not self.config.flags["allow_unused_components"]:
+            raise ValueError(print_str)
+        for container, names in unused.values():
+            for name in names:
+                container.remove(name)
+        logger.info(print_str, extra=dict(format_type="log_urgent"))
+        logger.info(
+            "Removing unused components from model!",
+            extra=dict(format_type="log_urgent"),
+        )
+        # containers may have changed
+        self._cache_container_keys()
 
     def _init_2_5_link_compartments_to_species(self):
         """Linking compartments and compartment dimensionality to species,
@@ -638,15 +661,20 @@ class Model:
             "Linking compartments and compartment dimensionality to species",
             extra=dict(format_type="log"),
         )
+        # pint conversions are slow, so only convert once per pair of
+        # (diffusion units, compartment units)
+        conversions = dict()
         for species in self.sc:
             species.compartment = self.cc[species.compartment_name]
-            species.dimensionality = self.cc[species.compartment_name].dimensionality
+            species.dimensionality = species.compartment.dimensionality
             # convert diffusion coeff to units consistent with mesh
-            diffusion_conversion = species.diffusion_units.to(
-                species.compartment.compartment_units**2 / unit.s
-            )
-            species.diffusion_units = species.compartment.compartment_units**2 / unit.s
-            species.D *= diffusion_conversion.magnitude
+            key = (species.diffusion_units.units, species.compartment.compartment_units.units)
+            if key not in conversions:
+                new_units = species.compartment.compartment_units**2 / unit.s
+                conversions[key] = (new_units, species.diffusion_units.to(new_units).magnitude)
+            species.diffusion_units, diffusion_conversion = conversions[key]
+            if diffusion_conversion != 1.0:
+                species.D *= diffusion_conversion
 
     def _init_2_6_link_species_to_compartments(self):
         """Links species to compartments - a species is considered to be
@@ -667,10 +695,8 @@ class Model:
             extra=dict(format_type="log"),
         )
         for compartment in self.cc:
-            index = 0
-            for species in list(compartment.species.values()):
+            for index, species in enumerate(compartment.species.values()):
                 species.dof_index = index
-                index += 1
 
     # Step 3 - Mesh Initializations
     def _init_3_1_define_child_meshes(self):
@@ -716,22 +742,26 @@ class Model:
         # even though the mapping was successfully built
         # (when (surface intersect volume) != surface)
         # with common._stdout_redirected():
+        # Collect the (surface, volume) pairs to map first so that nonadjacent
+        # compartments are filtered out before any mappings are built
+        mesh_pairs = []
         for child_mesh in self.parent_mesh.child_surface_meshes:
+            nonadjacent_names = frozenset(
+                getattr(child_mesh.compartment, "nonadjacent_compartment_list", None) or ()
+            )
             for sibling_volume_mesh in self.parent_mesh.child_volume_meshes:
-                if hasattr(child_mesh.compartment, "nonadjacent_compartment_list"):
-                    if (
-                        sibling_volume_mesh.compartment.name
-                        in child_mesh.compartment.nonadjacent_compartment_list
-                    ):
-                        logger.debug(
-                            "Skipping mapping between {} and {}".format(
-                                child_mesh.compartment.name,
-                                sibling_volume_mesh.compartment.name,
-                            ),
-                            extra=dict(format_type="log"),
-                        )
-                        continue
-                child_mesh.dolfin_mesh.build_mapping(sibling_volume_mesh.dolfin_mesh)
+                if sibling_volume_mesh.compartment.name in nonadjacent_names:
+                    logger.debug(
+                        "Skipping mapping between %s and %s",
+                        child_mesh.compartment.name,
+                        sibling_volume_mesh.compartment.name,
+                        extra=dict(format_type="log"),
+                    )
+                    continue
+                mesh_pairs.append((child_mesh, sibling_volume_mesh))
+
+        for child_mesh, sibling_volume_mesh in mesh_pairs:
+            child_mesh.dolfin_mesh.build_mapping(sibling_volume_mesh.dolfin_mesh)
 
     def _init_3_7_get_integration_measures(self):
         """Get integration measures for parent mesh and child meshes"""
@@ -751,19 +781,39 @@ class Model:
         value does not change the underlying dolfin object.
         Values must be assigned via :code:`parameter.dolfin_constant.assign()`
         """
+        # Parameters with identical expressions share a single dolfin.Expression
+        # (they all depend on the same time constant self.T), which avoids
+        # generating and compiling the same C++ code more than once
+        expressions = dict()
+
+        def get_expression(sym_expr, degree):
+            key = (sym_expr, degree)
+            if key not in expressions:
+                expressions[key] = d.Expression(
+                    sym.printing.ccode(sym_expr), t=self.T, degree=degree
+                )
+            return expressions[key]
+
         # Create a dolfin.Constant() for constant parameters
         for parameter in self.pc.values:
             if parameter.type == ParameterType.constant:
                 parameter.dolfin_constant = d.Constant(parameter.value, name=parameter.name)
             elif parameter.type == ParameterType.expression and parameter.is_space_dependent:
-                # use higher degree to avoid interpolation error
-                parameter.dolfin_expression = d.Expression(
-                    sym.printing.ccode(parameter.sym_expr), t=self.T, degree=3
-                )
+                if parameter.use_preintegration and parameter.preint_sym_expr is not None:
+                    # (F(t) - F(tn))/dt is compiled once in terms of the model time
+                    # constants, which are assigned every time step
+                    t, tn, dt = sym.symbols("t tn dt")
+                    preint_expr = (
+                        parameter.preint_sym_expr - parameter.preint_sym_expr.subs({t: tn})
+                    ) / dt
+                    parameter.dolfin_expression = d.Expression(
+                        sym.printing.ccode(preint_expr), t=self.T, tn=self.Tn, dt=self.dT, degree=3
+                    )
+                else:
+                    # use higher degree to avoid interpolation error
+                    parameter.dolfin_expression = get_expression(parameter.sym_expr, 3)
             elif parameter.type == ParameterType.expression and not parameter.use_preintegration:
-                parameter.dolfin_expression = d.Expression(
-                    sym.printing.ccode(parameter.sym_expr), t=self.T, degree=1
-                )
+                parameter.dolfin_expression = get_expression(parameter.sym_expr, 1)
             elif parameter.type == ParameterType.expression and parameter.use_preintegration:
                 parameter.dolfin_constant = d.Constant(parameter.value, name=parameter.name)
             elif parameter.type == ParameterType.from_file:
@@ -774,18 +824,10 @@ class Model:
         (We want to have the highest number of dofs first)
         """
         # addressing https://github.com/justinlaughlin/smart/issues/36
-        self._active_compartments = list(self.cc.Dict.values())
         self._all_compartments = list(self.cc.Dict.values())
-        it_idx = 0
-        rm_idx = np.array([])
-        for compartment in self._active_compartments:
-            if compartment.num_species < 1:
-                rm_idx = np.append(rm_idx, it_idx)
-            it_idx = it_idx + 1
-        for i in range(len(rm_idx)):
-            rm_cur = int(rm_idx[i])
-            del self._active_compartments[rm_cur]
-            rm_idx = rm_idx - 1  # adjust indices to compensate after deleting
+        self._active_compartments = [
+            compartment for compartment in self._all_compartments if compartment.num_species >= 1
+        ]
         for idx, compartment in enumerate(self._active_compartments):
             compartment.dof_index = idx
 
@@ -805,15 +847,30 @@ class Model:
         )
         # Aliases
         max_compartment_name = max([len(compartment_name) for compartment_name in self.cc.keys])
+        # Compartments whose reactions or initial conditions depend on curvature
+        curv_compartments = {
+            compartment_name
+            for reaction in self.rc
+            if "curv" in reaction._free_symbols
+            for compartment_name in reaction.compartments
+        }
+        curv_compartments.update(
+            species.compartment_name
+            for species in self.sc
+            # curvature-dependent initial conditions are kept as strings
+            if isinstance(getattr(species, "initial_condition_expression", None), str)
+        )
 
         # Make the individual function spaces (per compartment)
         for compartment in self._active_compartments:
             # Aliases
             logger.debug(
-                f"Defining function space for {compartment.name}"
-                f"{' '*(max_compartment_name-len(compartment.name))} "
-                f"(dim: {compartment.dimensionality}, "
-                f"species: {compartment.num_species}, dofs: {compartment.num_dofs})",
+                "Defining function space for %-*s (dim: %s, species: %s, dofs: %s)",
+                max_compartment_name,
+                compartment.name,
+                compartment.dimensionality,
+                compartment.num_species,
+                compartment.num_dofs,
                 extra=dict(format_type="log"),
             )
 
@@ -830,12 +887,12 @@ class Model:
                 )
 
             if self.parent_mesh.curvature is not None:
-                scalarFunctionSpace = d.FunctionSpace(
-                    self.child_meshes[compartment.name].dolfin_mesh, "P", 1
-                )
-                compartment.curv_func = self.mf0_to_fun(
-                    self.parent_mesh.curvature, scalarFunctionSpace
-                )
+                compartment._curv_func_factory = partial(self._get_curvature_function, compartment)
+                # creating the function is collective in parallel, so create it here on
+                # every process for the compartments known to need it rather than on
+                # first access
+                if compartment.name in curv_compartments:
+                    compartment.curv_func = self._get_curvature_function(compartment)
 
         self.V = [compartment.V for compartment in self._active_compartments]
         # Make the MixedFunctionSpace
@@ -892,13 +949,14 @@ class Model:
                 # compartment.u[key] = sub(func,cidx) #func.sub(cidx)
                 # u is a function from a MixedFunctionSpace so u.sub()
                 # is appropriate here
-                compartment.u[key] = sub(func, cidx)  # func.sub(cidx)
-                if compartment.u[key].num_sub_spaces() > 1:
+                compartment_u = sub(func, cidx)  # func.sub(cidx)
+                compartment.u[key] = compartment_u
+                if compartment_u.num_sub_spaces() > 1:
                     # _usplit are the actual functions we use to construct
                     # variational forms
-                    compartment._usplit[key] = d.split(compartment.u[key])
+                    compartment._usplit[key] = d.split(compartment_u)
                 else:
-                    compartment._usplit[key] = (compartment.u[key],)  # one element tuple
+                    compartment._usplit[key] = (compartment_u,)  # one element tuple
 
             # since we are using TrialFunctions() and TestFunctions()
             # this is the proper
@@ -916,18 +974,23 @@ class Model:
             extra=dict(format_type="log"),
         )
         for compartment in self._active_compartments:
+            # (key, compartment function, split compartment function) triples
+            compartment_functions = [
+                (key, compartment_u, compartment._usplit[key])
+                for key, compartment_u in compartment.u.items()
+            ]
             # loop through species and add the name/index
             for species in compartment.species.values():
-                species.V = sub(compartment.V, species.dof_index)
-                species.v = sub(compartment.v, species.dof_index)
+                sidx = species.dof_index
+                species.V = sub(compartment.V, sidx)
+                species.v = sub(compartment.v, sidx)
                 species.dof_map = self.dolfin_get_dof_indices(species)  # species.V.dofmap().dofs()
 
-                for key in compartment.u.keys():
-                    # compartment.u[key].sub(species.dof_index)
-                    species.u[key] = sub(compartment.u[key], species.dof_index)
+                for key, compartment_u, compartment_usplit in compartment_functions:
                     # compartment.u[key].sub(species.dof_index)
-                    species._usplit[key] = sub(compartment._usplit[key], species.dof_index)
-                species.ut = sub(compartment.ut, species.dof_index)
+                    species.u[key] = sub(compartment_u, sidx)
+                    species._usplit[key] = sub(compartment_usplit, sidx)
+                species.ut = sub(compartment.ut, sidx)
 
     def _init_4_5_name_functions(self):
         """Assign function names based on compartment name, species index, and species name"""
@@ -957,13 +1020,13 @@ class Model:
         # sanity check
         for compartment in self._active_compartments:  # self.cc:
             idx = compartment.dof_index
-            compartment.num_dofs
-            compartment.num_dofs_local
+            num_dofs = compartment.num_dofs
+            num_dofs_local = compartment.num_dofs_local
             # function size == dofs
+            uvec = compartment.u["u"].vector()
             if self.mpi_size == 1:
-                assert compartment.u["u"].vector().size() == compartment._num_dofs
-            if self.mpi_size >= 1:
-                assert compartment.u["u"].vector().get_local().size == compartment._num_dofs_local
+                assert uvec.size() == num_dofs
+            assert uvec.local_size() == num_dofs_local
 
             # number of sub spaces == number of species
             if compartment.num_species == 1:
@@ -974,8 +1037,9 @@ class Model:
                     assert compartment.u[ukey].num_sub_spaces() == compartment.num_species
 
             # function space matches W.sub(idx)
-            for func in list(compartment.u.values()) + [compartment.v]:
-                assert func.function_space().id() == self.W.sub_space(idx).id()
+            sub_space_id = self.W.sub_space(idx).id()
+            for func in (*compartment.u.values(), compartment.v):
+                assert func.function_space().id() == sub_space_id
 
     def _init_4_7_set_initial_conditions(self):
         """
@@ -985,24 +1049,23 @@ class Model:
         (see model.dolfin_set_function_values for further details)
         """
         logger.debug("Set function values to initial conditions", extra=dict(format_type="log"))
+        # (h5 file, dataset index) -> process-local values, so that a file is only
+        # opened and read once for all species and ukeys that use it
+        file_values = dict()
         for species in self.sc:
+            if isinstance(species.initial_condition, str):
+                initial_condition = species.initial_condition_expression
+            else:
+                initial_condition = species.initial_condition
             for ukey in species.u.keys():
-                if isinstance(species.initial_condition, float) or not isinstance(
-                    species.initial_condition, str
-                ):
-                    self.dolfin_set_function_values(species, ukey, species.initial_condition)
-                else:
-                    self.dolfin_set_function_values(
-                        species, ukey, species.initial_condition_expression
-                    )
+                self.dolfin_set_function_values(species, ukey, initial_condition, file_values)
                 if species.has_subdomain:
                     # restrict to specified subdomain
                     u_cur = self.cc[species.compartment_name].u[ukey]
                     u_new = create_restriction(u_cur, species.subdomain_data, species.subdomain_val)
-                    values = u_cur.vector().get_local()
-                    values_new = u_new.vector().get_local()
-                    values[species.dof_map] = values_new[species.dof_map]
-                    u_cur.vector().set_local(values)
+                    # only the (process-local) dofs of this species change
+                    rows = species.dof_map.astype(np.intc)
+                    u_cur.vector().set_local(u_new.vector().get_local(rows), rows)
                     u_cur.vector().apply("insert")
 
         for parameter in self.pc:
@@ -1022,19 +1085,10 @@ class Model:
                     )
                 V_cur = d.FunctionSpace(self.cc[parameter.compartment].dolfin_mesh, "P", 1)
                 parameter.dolfin_function = d.Function(V_cur)
+                # map from dofs to vertices (the ordering of the data in the h5 file)
+                parameter._mesh_map = d.dof_to_vertex_map(V_cur)
 
-                vec_new = self.load_vector(parameter.h5_file, parameter.tVec)
-                vec = parameter.dolfin_function.vector()
-                mesh_map = d.dof_to_vertex_map(parameter.dolfin_function.function_space())[:]
-                if len(vec_new) != len(mesh_map):
-                    raise ValueError(
-                        f"Vector from {str(parameter.h5_file)} "
-                        f"does not match function space for {parameter.name}"
-                    )
-                else:
-                    new_vals = vec_new[mesh_map]  # reorder to match dof ordering
-                vec.set_local(new_vals)
-                vec.apply("insert")
+                self._set_xdmf_parameter_values(parameter)
 
     def _init_5_1_reactions_to_fluxes(self):
         """Convert reactions to flux objects"""
@@ -1060,6 +1114,9 @@ class Model:
         linear_wrt_comp = {k: True for k in self.cc.keys}
         # nonlinear_wrt_comp = {k: False for k in self.cc.keys}
 
+        # forms are collected here and added to self.forms in one go
+        new_forms = []
+
         # reactive terms
         for flux in self.fc:
             # -1 factor in flux.form means this is a lhs term
@@ -1071,7 +1128,7 @@ class Model:
             linearity_dict = {k: flux.is_linear_wrt_comp.setdefault(k, True) for k in self.cc.keys}
             # linearity_dict = nonlinear_wrt_comp#{k :
             # flux.is_linear_wrt_comp.setdefault(k, True) for k in self.cc.keys}
-            self.forms.add(
+            new_forms.append(
                 Form(
                     f"{flux.name}",
                     flux.form,
@@ -1083,8 +1140,11 @@ class Model:
                 )
             )
 
+        axisymmetric = self.config.flags["axisymmetric_model"]
         for species in self.sc:
-            x = d.SpatialCoordinate(species.compartment.dolfin_mesh)
+            # integrands are weighted by the radial coordinate r = x[0] in axisymmetric models
+            if axisymmetric:
+                weight = d.SpatialCoordinate(species.compartment.dolfin_mesh)[0]
             u = species._usplit["u"]
             # ut = species.ut
             # un = species.u['n']
@@ -1092,11 +1152,6 @@ class Model:
             v = species.v
             D = species.D
             dx = species.compartment.mesh.dx
-            Dform_units = (
-                species.diffusion_units
-                * species.concentration_units
-                * species.compartment.compartment_units ** (species.compartment.dimensionality - 2)
-            )
             mass_form_units = (
                 species.concentration_units
                 / unit.s
@@ -1105,19 +1160,26 @@ class Model:
             # diffusion term
             if species.D == 0:
                 logger.debug(
-                    f"Species {species.name} has a diffusion coefficient of 0. "
+                    "Species %s has a diffusion coefficient of 0. "
                     "Skipping creation of diffusive form.",
+                    species.name,
                     extra=dict(format_type="log"),
                 )
             else:
+                Dform_units = (
+                    species.diffusion_units
+                    * species.concentration_units
+                    * species.compartment.compartment_units
+                    ** (species.compartment.dimensionality - 2)
+                )
                 D_constant = d.Constant(D, name=f"D_{species.name}")
-                if self.config.flags["axisymmetric_model"]:
-                    Dform = x[0] * D_constant * d.inner(d.grad(u), d.grad(v)) * dx
+                if axisymmetric:
+                    Dform = weight * D_constant * d.inner(d.grad(u), d.grad(v)) * dx
                 else:
                     Dform = D_constant * d.inner(d.grad(u), d.grad(v)) * dx
                 # exponent is -2 because of two gradients
 
-                self.forms.add(
+                new_forms.append(
                     Form(
                         f"diffusion_{species.name}",
                         Dform,
@@ -1130,11 +1192,11 @@ class Model:
                 )
 
             # mass (time derivative) terms
-            if self.config.flags["axisymmetric_model"]:
-                Muform = x[0] * (u) * v / self.dT * dx
+            if axisymmetric:
+                Muform = weight * (u) * v / self.dT * dx
             else:
                 Muform = (u) * v / self.dT * dx
-            self.forms.add(
+            new_forms.append(
                 Form(
                     f"mass_u_{species.name}",
                     Muform,
@@ -1145,11 +1207,11 @@ class Model:
                     linear_wrt_comp,
                 )
             )
-            if self.config.flags["axisymmetric_model"]:
-                Munform = x[0] * (-un) * v / self.dT * dx
+            if axisymmetric:
+                Munform = weight * (-un) * v / self.dT * dx
             else:
                 Munform = (-un) * v / self.dT * dx
-            self.forms.add(
+            new_forms.append(
                 Form(
                     f"mass_un_{species.name}",
                     Munform,
@@ -1160,22 +1222,21 @@ class Model:
                     linear_wrt_comp,
                 )
             )
-        # FIXME: `has_diffusive_forms` is only in commented out code of
-        # `initialize_discrete_variational_problem_and_solver`
+        self.forms.add(new_forms)
+
+        # `has_diffusive_forms` selects the fieldsplit preconditioner per compartment in
+        # `initialize_discrete_variational_problem_and_solver`.
+        # A diffusive form is created above for exactly the species with D != 0
         for compartment in self.cc:
-            diffusive_forms = [
-                f
-                for f in self.forms
-                if f.compartment.name == compartment.name and f.form_type == "diffusion"
-            ]
-            if len(diffusive_forms) == 0:
+            compartment.has_diffusive_forms = any(
+                species.D != 0 for species in compartment.species.values()
+            )
+            if not compartment.has_diffusive_forms:
                 logger.debug(
-                    f"Compartment {compartment.name} has no diffusive forms.",
+                    "Compartment %s has no diffusive forms.",
+                    compartment.name,
                     extra=dict(format_type="log"),
                 )
-                compartment.has_diffusive_forms = False
-            else:
-                compartment.has_diffusive_forms = True
 
     def initialize_discrete_variational_problem_and_solver(self):
         """
@@ -1198,7 +1259,9 @@ class Model:
         # in model.get_block_system()),
         # we are only going to separate fluxes that are linear with
         # respect to all compartments
-        self.Fsum_all = sum([f.lhs for f in self.forms])  # Sum of all forms
+        # Sum of all forms. Adding UFL forms pairwise copies the integral list at
+        # every step, so collect all integrals and build the sum in one go
+        self.Fsum_all = UFLForm(list(chain.from_iterable(f.lhs.integrals() for f in self.forms)))
         if self.config.solver["snes_preassemble_linear_system"]:
             # debug attempt
             logger.debug(
@@ -1216,7 +1279,9 @@ class Model:
         for compartment in self._active_compartments:
             res = self.get_compartment_residual(compartment, norm=2)
             logger.debug(
-                f"Initial L2-norm of compartment {compartment.name} is {res}",
+                "Initial L2-norm of compartment %s is %s",
+                compartment.name,
+                res,
                 extra=dict(format_type="log"),
             )
             if res > 1:
@@ -1241,6 +1306,9 @@ class Model:
 
             self.problem.init_petsc_matnest()
             self.problem.init_petsc_vecnest()
+            # The SNES solution vector must not alias self.u: during line searches SNES
+            # evaluates F at trial points, and smartSNESProblem.copy_u writes those into
+            # self.u, which would overwrite the current iterate if they shared storage
             if len(self.problem.global_sizes) == 1:
                 self._ubackend = u[0].vector().vec().copy()
             else:
@@ -1258,7 +1326,7 @@ class Model:
 
             def monitor(snes, it, fgnorm):
                 # prints out residual at each Newton iteration
-                logger.debug("  " + str(it) + " SNES Function norm " + "{:e}".format(fgnorm))
+                logger.debug("  %s SNES Function norm %e", it, fgnorm)
 
             self.solver.setMonitor(monitor)
             opts = PETSc.Options()
@@ -1292,12 +1360,14 @@ class Model:
                 self.solver.ksp.pc.setFieldSplitType(1)
                 subksps = self.solver.ksp.pc.getFieldSplitSubKSP()
                 for i, subksp in enumerate(subksps):
-                    # subksp.setType('preonly')
-                    # # If there is not diffusion then this is really just a distributed set of ODEs
-                    # if not self._active_compartments[i].has_diffusive_forms:
-                    #     subksp.pc.setType('none')
                     subksp.setType("preonly")
-                    subksp.pc.setType("hypre")
+                    # If there is no diffusion then this block is really just a distributed
+                    # set of ODEs (mass matrix + reaction terms), for which AMG setup is
+                    # pure overhead and a diagonal preconditioner suffices
+                    if self._active_compartments[i].has_diffusive_forms:
+                        subksp.pc.setType("hypre")
+                    else:
+                        subksp.pc.setType("jacobi")
         else:
             logger.debug(
                 "Using dolfin MixedNonlinearVariationalSolver",
@@ -1358,12 +1428,27 @@ class Model:
         """Return total number of dof for current model"""
         return [uj.function_space().dim() for uj in u]
 
+    def _extract_blocks(self, Fsum):
+        """Split Fsum into blocks by compartment. The result for the last form is
+        cached so that building F and J from the same form only splits it once
+        """
+        if Fsum is not self._extracted_blocks[0]:
+            self._extracted_blocks = (Fsum, d.extract_blocks(Fsum))
+        return self._extracted_blocks[1]
+
+    def _form_compiler_parameters(self):
+        """Copy of the configured form compiler parameters for a single :code:`d.Form`
+        (dolfin adds its include directories to the dictionary it is given)
+        """
+        fc_parameters = self.config.solver["form_compiler_parameters"]
+        return None if fc_parameters is None else deepcopy(fc_parameters)
+
     def get_block_F(self, Fsum, u):
         """Assemble block F-vector by compartment
         (F is the residual)
         """
         # blocks/partitions are by compartment, not species
-        Fblock = d.extract_blocks(Fsum)
+        Fblock = self._extract_blocks(Fsum)
 
         # Add in placeholders for empty blocks of F
         if len(Fblock) != len(u):
@@ -1398,7 +1483,9 @@ class Model:
                         )
                         Fs.append(None)
                     else:
-                        Fs.append(d.Form(Fsub))
+                        Fs.append(
+                            d.Form(Fsub, form_compiler_parameters=self._form_compiler_parameters())
+                        )
                 Flist.append(Fs)
 
         return Flist
@@ -1408,12 +1495,17 @@ class Model:
         (J is the Jacobian)
         """
         # blocks/partitions are by compartment, not species
-        Fblock = d.extract_blocks(Fsum)
+        Fblock = self._extract_blocks(Fsum)
         J = []
         for Fi in Fblock:
+            # dF_i/du_j is identically zero if u_j does not appear in F_i, so skip
+            # the symbolic differentiation (treated as an empty block below)
+            Fi_coefficients = set(Fi.coefficients())
             for uj in u:
-                dFdu = expand_derivatives(d.derivative(Fi, uj))
-                J.append(dFdu)
+                if uj in Fi_coefficients:
+                    J.append(expand_derivatives(d.derivative(Fi, uj)))
+                else:
+                    J.append(None)
 
         # Check number of blocks in the residual and solution are coherent
         assert len(J) == len(u) * len(u)
@@ -1424,8 +1516,11 @@ class Model:
             idx_i, idx_j = divmod(idx, len(u))
             if Ji is None or Ji.empty():
                 logger.info(
-                    f"J{idx_i}{idx_j} = dF[{self.cc.get_index(idx_i).name}])"
-                    f"/du[{self.cc.get_index(idx_j).name}] is empty",
+                    "J%s%s = dF[%s])/du[%s] is empty",
+                    idx_i,
+                    idx_j,
+                    self.cc.get_index(idx_i).name,
+                    self.cc.get_index(idx_j).name,
                     extra=dict(format_type="logred"),
                 )
                 Jlist.append([d.cpp.fem.Form(2, 0)])
@@ -1440,7 +1535,9 @@ class Model:
                             f"is empty on integration domain {domain}",
                             extra=dict(format_type="logred"),
                         )
-                    Js.append(d.Form(Jsub))
+                    Js.append(
+                        d.Form(Jsub, form_compiler_parameters=self._form_compiler_parameters())
+                    )
                 Jlist.append(Js)
 
         return Jlist
@@ -1456,20 +1553,19 @@ class Model:
     def set_time(self, t):
         """Explicitly change time"""
         if t != self.t:
-            logger.debug(f"Time changed from {self.t} to {t}", extra=dict(format_type="log"))
+            logger.debug("Time changed from %s to %s", self.t, t, extra=dict(format_type="log"))
             self.t = t
             self.T.assign(t)
 
     def set_dt(self, dt):
         """Explicitly change time-step"""
         dt = self.rounded_decimal(dt)
-        if self.config.solver["time_precision"] is not None:
-            dt = round(dt, self.config.solver["time_precision"])
 
         if dt != self.dt:
-            logger.debug(f"dt set to {dt} (previously {self.dt})", extra=dict(format_type="log"))
+            logger.debug("dt set to %s (previously %s)", dt, self.dt, extra=dict(format_type="log"))
             self.dt = dt
             self.dT.assign(dt)
+            self._dT_value = dt
 
     def adjust_dt_if_prescribed(self):
         """Checks to see if the size of a full-time step would pass a "reset dt"
@@ -1483,8 +1579,7 @@ class Model:
         # check if we pass a reset dt checkpoint
         tnow = self.rounded_decimal(self.t)  # time right now
         dtnow = self.rounded_decimal(self.dt)
-        tnext = tnow + dtnow  # the final time if dt is not reset
-        tnext = self.rounded_decimal(tnext)
+        tnext = tnow + dtnow  # the final time if dt is not reset (exact, same decimal grid)
         # next time to adjust dt, and the value of dt to adjust to
         tadjust, dtadjust = self.config.solver["adjust_dt"][0]
         tadjust = self.rounded_decimal(tadjust)
@@ -1494,8 +1589,11 @@ class Model:
         if self.reset_dt or tadjust == tnow:
             self.set_dt(dtadjust)
             logger.debug(
-                f"[{self.idx}, t={tnow}] Adjusted time-step "
-                f"(dt = {dtnow} -> {self.dt}) to match config specified value",
+                "[%s, t=%s] Adjusted time-step (dt = %s -> %s) to match config specified value",
+                self.idx,
+                tnow,
+                dtnow,
+                self.dt,
                 extra=dict(format_type="log"),
             )
             del self.config.solver["adjust_dt"][0]
@@ -1513,19 +1611,22 @@ class Model:
             # (e.g. current time is tnow=0.999999999, tadjust=1.0,
             # dtadjust=0.01, instead of changing current dt to tadjust-tnow,
             # we change it to dtadjust)
-            logger.debug(f"tadjust = {tadjust}")
-            logger.debug(f"tnow = {tnow}")
-            logger.debug(f"dtadjust = {dtadjust}")
+            logger.debug("tadjust = %s", tadjust)
+            logger.debug("tnow = %s", tnow)
+            logger.debug("dtadjust = %s", dtadjust)
             # this is needed otherwise very small time-steps might be
             # taken which wont converge
             new_dt = self.rounded_decimal(max([tadjust - tnow, dtadjust]))
-            logger.debug(f"newdt = {new_dt}")
+            logger.debug("newdt = %s", new_dt)
 
             if dtadjust > tadjust - tnow:
                 logger.info(
-                    f"[{self.idx}, t={tnow}] Adjusted time-step "
-                    f"(dt = {dtnow} -> {new_dt}) to match config specified "
+                    "[%s, t=%s] Adjusted time-step (dt = %s -> %s) to match config specified "
                     "value (adjusted early because dt_adjust > t_adjust-t_now)",
+                    self.idx,
+                    tnow,
+                    dtnow,
+                    new_dt,
                     extra=dict(format_type="log"),
                 )
                 self.set_dt(new_dt)
@@ -1533,8 +1634,12 @@ class Model:
                 self.reset_dt = False
             else:
                 logger.info(
-                    f"[{self.idx}, t={tnow}] Adjusting time-step "
-                    f"(dt = {dtnow} -> {new_dt}) to avoid passing reset dt checkpoint",
+                    "[%s, t=%s] Adjusting time-step (dt = %s -> %s) "
+                    "to avoid passing reset dt checkpoint",
+                    self.idx,
+                    tnow,
+                    dtnow,
+                    new_dt,
                     extra=dict(format_type="log_important"),
                 )
                 self.set_dt(new_dt)
@@ -1546,11 +1651,12 @@ class Model:
         tnext = self.t + self.dt
         if tnext > self.final_t:
             new_dt = self.final_t - self.t
-            if self.config.solver["time_precision"] is not None:
-                new_dt = round(new_dt, self.config.solver["time_precision"])
             logger.info(
-                f"[{self.idx}, t={self.t}] Adjusting time-step "
-                f"(dt = {self.dt} -> {new_dt}) to avoid passing final time",
+                "[%s, t=%s] Adjusting time-step (dt = %s -> %s) to avoid passing final time",
+                self.idx,
+                self.t,
+                self.dt,
+                new_dt,
                 extra=dict(format_type="log"),
             )
             self.set_dt(new_dt)
@@ -1558,11 +1664,14 @@ class Model:
     def forward_time_step(self):
         """Take a step forward in time"""
         self.dt = self.rounded_decimal(self.dt)
-        if self.config.solver["time_precision"] is not None:
-            self.dt = round(self.dt, self.config.solver["time_precision"])
         self.tn = self.rounded_decimal(self.t)  # save the previous time
-        self.t = self.rounded_decimal(self.t + self.dt)
-        self.dT.assign(self.dt)
+        # sum of two values on the same decimal grid is exact, no need to round again
+        self.t = self.tn + self.dt
+        self.Tn.assign(self.tn)
+        # dt is constant over most steps, only touch the dolfin constant when it changes
+        if self.dt != self._dT_value:
+            self.dT.assign(self.dt)
+            self._dT_value = self.dt
         self.T.assign(self.t)
 
         self.tvec.append(self.t)
@@ -1611,7 +1720,10 @@ class Model:
         # march forward in time and update time-dependent parameters
         self.forward_time_step()
         logger.info(
-            f"Beginning time-step {self.idx} [time={self.t}, dt={self.dt}]",
+            "Beginning time-step %s [time=%s, dt=%s]",
+            self.idx,
+            self.t,
+            self.dt,
             extra=dict(
                 format_type="timestep",
                 new_lines=[1, 0],
@@ -1628,79 +1740,73 @@ class Model:
 
             # Store/compute timings
             logger.info(
-                f"Completed time-step {self.idx} [time={self.t}, dt={self.dt}]",
+                "Completed time-step %s [time=%s, dt=%s]",
+                self.idx,
+                self.t,
+                self.dt,
                 extra=dict(
                     new_lines=[1, 0],
                     format_type="solverstep",
                 ),
             )
+            assembly_time = 0.0
             for k in [
                 "snes initialize zero matrices",
                 "snes jacobian assemble",
                 "snes residual assemble",
-                "snes all",
             ]:
-                print_results = False if k == "snes all" else True
-                self.stopwatches[k].stop(print_results)
-
-            assembly_time = (
-                self.stopwatches["snes jacobian assemble"].stop_timings[-1]
-                + self.stopwatches["snes residual assemble"].stop_timings[-1]
-                + self.stopwatches["snes initialize zero matrices"].stop_timings[-1]
-            )
+                stopwatch = self.stopwatches[k]
+                stopwatch.stop()
+                assembly_time += stopwatch.stop_timings[-1]
+            snes_all = self.stopwatches["snes all"]
+            snes_all.stop(False)
             # time to solve minus all the assemblies
-            solve_time = self.stopwatches["snes all"].stop_timings[-1] - assembly_time
+            solve_time = snes_all.stop_timings[-1] - assembly_time
             self.stopwatches["snes total assemble"].set_timing(assembly_time)
             self.stopwatches["snes total solve"].set_timing(solve_time)
-            self.stopwatches["snes all"].print_last_stop()
+            snes_all.print_last_stop()
             # self.stopwatch("SNES solver", stop=True)
 
             # Check how solver did
-            self.idx_nl.append(self.solver.its)
-            self.idx_l.append(self.solver.ksp.its)
-            logger.info(
-                f"Non-linear solver iterations: {self.solver.its}",
-                extra=dict(format_type="log"),
-            )
-            logger.info(
-                f"Linear solver iterations: {self.solver.ksp.its}",
-                extra=dict(format_type="log"),
-            )
-            logger.info(
-                f"SNES converged reason: {self.solver.getConvergedReason()}",
-                extra=dict(format_type="log"),
-            )
-            logger.info(
-                f"KSP converged reason: {self.solver.ksp.getConvergedReason()}",
-                extra=dict(format_type="log"),
-            )
-            logger.info(
-                f"KSP residual norm: {self.solver.ksp.getResidualNorm()}",
-                extra=dict(format_type="log"),
-            )
+            nl_its = self.solver.its
+            l_its = self.solver.ksp.its
+            self.idx_nl.append(nl_its)
+            self.idx_l.append(l_its)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Non-linear solver iterations: %s", nl_its, extra=dict(format_type="log")
+                )
+                logger.info("Linear solver iterations: %s", l_its, extra=dict(format_type="log"))
+                logger.info(
+                    "SNES converged reason: %s",
+                    self.solver.getConvergedReason(),
+                    extra=dict(format_type="log"),
+                )
+                logger.info(
+                    "KSP converged reason: %s",
+                    self.solver.ksp.getConvergedReason(),
+                    extra=dict(format_type="log"),
+                )
+                logger.info(
+                    "KSP residual norm: %s",
+                    self.solver.ksp.getResidualNorm(),
+                    extra=dict(format_type="log"),
+                )
 
             # confirm that the solution is greater than or equal to zero,
             # otherwise reduce timestep and recompute
             if self.config.solver["reset_timestep_for_negative_solution"]:
-                negVals = False
-                for idx in range(self.num_active_compartments):
-                    curSub = self.u["u"].sub(idx)
-                    curVec = curSub.vector()
-                    if any(
-                        curVec < -1e-6
-                    ):  # if value is "too negative", we reduce time step and recompute
-                        negVals = True
-                        break
+                # if value is "too negative", we reduce time step and recompute
+                # (GenericVector.min() is a reduction over all processes, so every
+                # process takes the same branch)
+                negVals = any(
+                    self.u["u"].sub(idx).vector().min() < -1e-6
+                    for idx in range(self.num_active_compartments)
+                )
                 if negVals:
                     self.reset_timestep()
                     # Re-initialize SNES solver
-                    if len(self.problem.global_sizes) == 1:
-                        self._ubackend = self.u["u"]._functions[0].vector().vec().copy()
-                    else:
-                        self._ubackend = PETSc.Vec().createNest(
-                            [usub.vector().vec().copy() for usub in self.u["u"]._functions],
-                            comm=self.mpi_comm_world,
-                        )
+                    self._reset_ubackend()
                     # need to re-link global function with species-specific functions
                     # after re-setting previous solution
                     self._init_4_4_get_species_u_v_V_dofmaps()
@@ -1710,13 +1816,18 @@ class Model:
                     return
                 else:  # if value is >= -tol, then set any slightly negative solutions to zero
                     for idx in range(self.num_active_compartments):
-                        curSub = self.u["u"].sub(idx)
-                        curVec = curSub.vector()
-                        for zeroIdx in np.asarray(curVec < 0).nonzero():
-                            curSub.vector()[zeroIdx] = 0
-                            d.assign(self.u["u"].sub(idx), curSub)
-                    for idx in np.asarray(self._ubackend.array < 0).nonzero():
-                        self._ubackend.array[idx] = 0
+                        curVec = self.u["u"].sub(idx).vector()
+                        values = curVec.get_local()
+                        np.maximum(values, 0.0, out=values)
+                        curVec.set_local(values)
+                        curVec.apply("insert")
+                    if self._ubackend.getType() == PETSc.Vec.Type.NEST:
+                        backend_vecs = self._ubackend.getNestSubVecs()
+                    else:
+                        backend_vecs = [self._ubackend]
+                    for backend_vec in backend_vecs:
+                        values = backend_vec.array
+                        np.maximum(values, 0.0, out=values)
 
             if not self.solver.converged:
                 if not self.config.solver["attempt_timestep_restart_on_divergence"]:
@@ -1727,7 +1838,8 @@ class Model:
                     )
                 self.stopwatches["Total time step"].stop()
                 logger.info(
-                    f"SNES failed to converge. Reason = {self.solver.getConvergedReason()}",
+                    "SNES failed to converge. Reason = %s",
+                    self.solver.getConvergedReason(),
                     extra=dict(format_type="log"),
                 )
                 logger.debug(
@@ -1736,12 +1848,7 @@ class Model:
                 )
                 self.reset_timestep()
                 # Re-initialize SNES solver
-                if len(self.problem.global_sizes) == 1:
-                    self._ubackend = self.u["u"]._functions[0].vector().vec().copy()
-                else:
-                    self._ubackend = PETSc.Vec().createNest(
-                        [usub.vector().vec().copy() for usub in self.u["u"]._functions]
-                    )
+                self._reset_ubackend()
                 # need to re-link global function with species-specific functions
                 # after re-setting previous solution
                 self._init_4_4_get_species_u_v_V_dofmaps()
@@ -1758,15 +1865,20 @@ class Model:
             )
             self.solver.solve()
 
-            logger.info(
-                f"Total residual: {self.get_total_residual(norm=2)}",
-                extra=dict(format_type="log"),
-            )
+            # Assembling the total residual is expensive, only do it if it will be shown
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Total residual: %s",
+                    self.get_total_residual(norm=2),
+                    extra=dict(format_type="log"),
+                )
             residuals = dict()
             for compartment in self._active_compartments:
                 residuals[compartment.name] = self.get_compartment_residual(compartment, norm=2)
                 logger.debug(
-                    f"L2-norm of compartment {compartment.name} is {residuals[compartment.name]}",
+                    "L2-norm of compartment %s is %s",
+                    compartment.name,
+                    residuals[compartment.name],
                     extra=dict(format_type="log"),
                 )
                 if residuals[compartment.name] > 1:
@@ -1788,9 +1900,19 @@ class Model:
         # self.stopwatch("Total time step", stop=True)
         self.stopwatches["Total time step"].stop()
 
+    def _reset_ubackend(self):
+        """Copy the current solution into the existing SNES solution vector
+        (used when restarting a time-step, avoids allocating new PETSc vectors)"""
+        u = self.u["u"]._functions
+        if len(self.problem.global_sizes) == 1:
+            u[0].vector().vec().copy(self._ubackend)
+        else:
+            for usub, backend_vec in zip(u, self._ubackend.getNestSubVecs()):
+                usub.vector().vec().copy(backend_vec)
+
     def reset_timestep(self, dt_scale=0.20):
         """t failed. Revert t->tn and revert solution"""
-        logger.debug(f"Resetting time-step: {self.idx}", extra=dict(format_type="log"))
+        logger.debug("Resetting time-step: %s", self.idx, extra=dict(format_type="log"))
         # Change t and decrease dt
         self.set_time(self.tvec[-2])  # t=tn
         self.set_dt(float(self.dtvec[-1]) * dt_scale)  # dt=dt*0.2
@@ -1856,89 +1978,79 @@ class Model:
         tn = float(self.tn)
 
         # Update time dependent parameters
-        for parameter_name, parameter in self.pc.items:
+        for parameter_name, parameter in self._time_dependent_parameters:
             new_value = None
             if parameter.type == ParameterType.from_xdmf:
-                vec_new = self.load_vector(parameter.h5_file, parameter.tVec)
-                vec = parameter.dolfin_function.vector()
-                mesh_map = d.dof_to_vertex_map(parameter.dolfin_function.function_space())[:]
-                if len(vec_new) != len(mesh_map):
-                    raise ValueError(
-                        f"Vector from {str(parameter.h5_file)} "
-                        f"does not match function space for {parameter.name}"
-                    )
-                new_vals = vec_new[mesh_map]  # reorder to match dof ordering
-                vec.set_local(new_vals)
-                vec.apply("insert")
-                continue
-            if not parameter.is_time_dependent:
+                self._set_xdmf_parameter_values(parameter)
                 continue
             if not parameter.use_preintegration:
                 # Parameters that are defined as dolfin expressions will
                 # automatically be updated by model.T.assign(t)
                 if parameter.type == ParameterType.expression:
-                    parameter.value = parameter.sym_expr.subs({"t": t}).evalf()
-                    parameter.value_vector = np.vstack(
-                        (parameter.value_vector, [t, parameter.value])
-                    )
+                    if parameter.is_space_dependent:
+                        parameter.value = parameter.sym_expr.subs({"t": t}).evalf()
+                    else:
+                        parameter.value = float(self._lambdify_time(parameter.sym_expr)(t))
+                    parameter.append_value(t, parameter.value)
                     continue
                 # Parameters from a data file need to have their dolfin constant updated
                 if parameter.type == ParameterType.from_file:
-                    t_data = parameter.sampling_data[:, 0]
-                    p_data = parameter.sampling_data[:, 1]
+                    t_data, p_data = parameter._sampling_columns
                     # We never want time to extrapolate beyond the provided data.
                     if t < t_data[0] or t > t_data[-1]:
                         raise Exception("Parameter cannot be extrapolated beyond provided data.")
                     # Just in case... return a nan if value is outside of bounds
                     new_value = float(np.interp(t, t_data, p_data, left=np.nan, right=np.nan))
                     logger.debug(
-                        f"Time-dependent parameter {parameter_name} updated by data. "
-                        f"New value is {new_value}",
+                        "Time-dependent parameter %s updated by data. New value is %s",
+                        parameter_name,
+                        new_value,
                         extra=dict(format_type="log"),
                     )
 
             if parameter.use_preintegration:
                 if parameter.type == ParameterType.expression:
-                    if parameter.preint_sym_expr is None:  # then numerically approximate integral
-                        a = parameter.int_vec[-1]
-                        tsym = sym.symbols("t")
-                        intval, err = integrate.quad(lambdify(tsym, parameter.sym_expr), tn, t)
-                        b = a + intval
-                        parameter.int_vec.append(b)
-                    else:
-                        a = parameter.preint_sym_expr.subs({"t": tn}).evalf()
-                        b = parameter.preint_sym_expr.subs({"t": t}).evalf()
                     if parameter.is_space_dependent:
-                        parameter.dolfin_expression = d.Expression(
-                            sym.printing.ccode((b - a) / dt), degree=3
-                        )
+                        # The dolfin expression depends on self.T, self.Tn and self.dT
+                        # (see _init_4_0), which forward_time_step has already assigned
                         logger.debug(
-                            f"Time-dependent parameter {parameter_name} updated by "
-                            f"pre-integrated expression",
+                            "Time-dependent parameter %s updated by pre-integrated expression",
+                            parameter_name,
                             extra=dict(format_type="log"),
                         )
                         continue
+                    if parameter.preint_sym_expr is None:  # then numerically approximate integral
+                        a = parameter.int_vec[-1]
+                        intval, err = integrate.quad(self._lambdify_time(parameter.sym_expr), tn, t)
+                        b = a + intval
+                        parameter.int_vec.append(b)
                     else:
-                        new_value = float((b - a) / dt)
-                        logger.debug(
-                            f"Time-dependent parameter {parameter_name} updated by "
-                            f"pre-integrated expression. New value is {new_value}",
-                            extra=dict(format_type="log"),
-                        )
+                        preint_func = self._lambdify_time(parameter.preint_sym_expr)
+                        a = preint_func(tn)
+                        b = preint_func(t)
+                    new_value = float((b - a) / dt)
+                    logger.debug(
+                        "Time-dependent parameter %s updated by "
+                        "pre-integrated expression. New value is %s",
+                        parameter_name,
+                        new_value,
+                        extra=dict(format_type="log"),
+                    )
                 if parameter.type == ParameterType.from_file:
-                    int_data = parameter.preint_sampling_data
-                    a = np.interp(tn, int_data[:, 0], int_data[:, 1], left=np.nan, right=np.nan)
-                    b = np.interp(t, int_data[:, 0], int_data[:, 1], left=np.nan, right=np.nan)
+                    t_data, int_data = parameter._preint_sampling_columns
+                    a, b = np.interp([tn, t], t_data, int_data, left=np.nan, right=np.nan)
                     new_value = float((b - a) / dt)
                     logger.debug(
-                        f"Time-dependent parameter {parameter_name} updated by "
-                        f"pre-integrated data. New value is {new_value}",
+                        "Time-dependent parameter %s updated by "
+                        "pre-integrated data. New value is %s",
+                        parameter_name,
+                        new_value,
                         extra=dict(format_type="log"),
                     )
 
             if new_value is not None:
                 assert not np.isnan(new_value)
-                parameter.value_vector = np.vstack((parameter.value_vector, [t, new_value]))
+                parameter.append_value(t, new_value)
                 parameter.value = new_value
                 parameter.dolfin_constant.assign(new_value)
             else:
@@ -1955,9 +2067,10 @@ class Model:
         for ukey in ukeys:
             if ukey not in self.u.keys():
                 raise ValueError(f"Key {ukey} is not in model.u.keys()")
-            # for a function from a mixed function space
-            for idx in range(self.num_active_compartments):
-                self.u[ukey].sub(idx).assign(self.u[unew].sub(idx))
+            # a function from a mixed function space has no vector of its own, so
+            # copy compartment by compartment (each assign is a single vector copy)
+            for u_old, u_new in zip(self.u[ukey]._functions, self.u[unew]._functions):
+                u_old.assign(u_new)
 
     # =========================================================
     # Model - Data manipulation
@@ -1980,17 +2093,21 @@ class Model:
         species_idx = species.dof_index
 
         V = sub(species.compartment.V, species_idx, collapse_function_space=False)
+        dofmap = V.dofmap()
 
-        indices = np.array(V.dofmap().dofs())
+        indices = np.asarray(dofmap.dofs())
         # indices that this CPU owns
-        first_idx, _ = V.dofmap().ownership_range()
+        first_idx, _ = dofmap.ownership_range()
 
         return indices - first_idx  # subtract index offset to go from global -> local indices
 
-    def dolfin_set_function_values(self, sp, ukey, unew):
+    def dolfin_set_function_values(self, sp, ukey, unew, file_values=None):
         """Set values for dolfin function (usually for initial condition)
         Input unew should either be an expression giving the spatial dependence
         of u, a constant (float), or a vector of values.
+        Values read from a file are stored in file_values (keyed by file and
+        dataset index), so passing the same dictionary to several calls reads each
+        file only once.
         :code:`d.assign(uold, unew)` works when uold is a subfunction
         :code:`uold.assign(unew)` does not (it will replace the entire function)
         """
@@ -2013,13 +2130,17 @@ class Model:
             uinterp = d.interpolate(unew, sp.V)
             d.assign(sp.u[ukey], uinterp)
         elif isinstance(unew, (float, int)):
-            uinterp = d.interpolate(d.Constant(unew), sp.V)
-            d.assign(sp.u[ukey], uinterp)
+            # a constant only needs to be written to the (process-local) species dofs
+            # of the compartment vector, no need to interpolate onto sp.V
+            rows = sp.dof_map.astype(np.intc)
+            uvec = sp.compartment.u[ukey].vector()
+            uvec.set_local(np.full(rows.size, float(unew)), rows)
+            uvec.apply("insert")
         elif isinstance(unew, Path):
             assert Path(
                 unew
             ).is_file(), f"{str(unew)} could not be found for loading initial conditions"
-            logger.debug(f"Loading initial condition for {sp.name} from file")
+            logger.debug("Loading initial condition for %s from file", sp.name)
             if unew.suffix == ".h5":
                 h5Cur = str(unew)
                 xdmfCur = h5Cur[0:-2] + "xdmf"
@@ -2052,6 +2173,7 @@ class Model:
                 self.t = self.rounded_decimal(self.load_init_time)
                 if self.load_init_idx > 0:  # then store prev time
                     self.tn = self.rounded_decimal(tVec[-3])
+                    self.Tn.assign(self.tn)
                 self.T.assign(self.t)
 
             if tVec[self.load_init_idx] != self.load_init_time:
@@ -2066,25 +2188,31 @@ class Model:
             else:
                 init_idx = self.load_init_idx
 
-            cur_file = d.HDF5File(self.parent_mesh.mpi_comm, h5Cur, "r")
-            if not cur_file.has_dataset(f"VisualisationVector/{init_idx}"):
-                raise TypeError(
-                    f"Unable to read initial condition for {sp.name} from file {str(unew)}"
-                )
-            start_vec = d.Vector()
-            cur_file.read(start_vec, f"VisualisationVector/{init_idx}", True)
-            cur_file.close()
-            vec = self.cc[sp.compartment_name].u[ukey].vector()
-            orig_vals = vec.get_local()
-            start_vals = start_vec.get_local()
-            mesh_map = d.dof_to_vertex_map(sp.V)[:]
-            start_vals = start_vals[mesh_map]  # reorder to match dof ordering
+            if file_values is None:
+                file_values = dict()
+            cache_key = (h5Cur, init_idx)
+            if cache_key not in file_values:
+                cur_file = d.HDF5File(self.parent_mesh.mpi_comm, h5Cur, "r")
+                if not cur_file.has_dataset(f"VisualisationVector/{init_idx}"):
+                    raise TypeError(
+                        f"Unable to read initial condition for {sp.name} from file {str(unew)}"
+                    )
+                start_vec = d.Vector()
+                cur_file.read(start_vec, f"VisualisationVector/{init_idx}", True)
+                cur_file.close()
+                file_values[cache_key] = start_vec.get_local()
+            start_vals = file_values[cache_key]
+            # the same map is needed for every ukey of this species, so compute it once
+            if sp._vertex_map is None:
+                sp._vertex_map = d.dof_to_vertex_map(sp.V)
+            start_vals = start_vals[sp._vertex_map]  # reorder to match dof ordering
             if len(start_vals) != len(sp.dof_map):
                 raise ValueError(
                     f"Vector from {str(unew)} does not match function space for {sp.name}"
                 )
-            orig_vals[sp.dof_map] = start_vals
-            vec.set_local(orig_vals)
+            # only the (process-local) species dofs of the compartment vector change
+            vec = self.cc[sp.compartment_name].u[ukey].vector()
+            vec.set_local(start_vals, sp.dof_map.astype(np.intc))
             vec.apply("insert")
         elif len(sp.dof_map) == len(unew):
             # unew must be an N x 4 array: [X, Y, Z, function_values]
@@ -2094,21 +2222,21 @@ class Model:
             function_values = unew[:, 3]
             # nearest neighbor interpolation
             # (in this case, matching up exactly with mesh points)
-            dof_vals_cur = np.zeros((len(mesh_coord),))
-            for i in range(len(dof_coord)):
-                dist_vec = np.sum((dof_coord[i, :] - mesh_coord) ** 2, axis=1)
-                dof_vals_cur[i] = function_values[np.argmin(dist_vec)]
-                if i % 1000 == 0:
-                    logger.debug(f"Set {i} of {len(dof_coord)} function values for {sp.name}")
+            _, nearest = cKDTree(mesh_coord).query(dof_coord, k=1)
+            dof_vals_cur = function_values[nearest]
+            logger.debug(
+                "Set %s function values for %s",
+                len(dof_coord),
+                sp.name,
+                extra=dict(format_type="log"),
+            )
             # indices = self.dolfin_get_dof_indices(sp)
             indices = sp.dof_map
             uvec = u.vector()
-            values = uvec.get_local()
-            values[indices] = dof_vals_cur
-            uvec.set_local(values)
+            uvec.set_local(dof_vals_cur, indices.astype(np.intc))
             uvec.apply("insert")
         elif isinstance(unew, d.Function):
-            logger.debug(f"Function already set for {sp.name}")
+            logger.debug("Function already set for %s", sp.name)
         else:
             raise NotImplementedError
 
@@ -2119,9 +2247,14 @@ class Model:
 
     def get_compartment_residual(self, compartment, norm=None):
         """returns compartment residual as given norm"""
-        res_vec = sum(
-            [d.assemble_mixed(form).get_local() for form in self.Fblocks_all[compartment.dof_index]]
-        )
+        forms = self.Fblocks_all[compartment.dof_index]
+        if len(forms) == 0:
+            res_vec = np.zeros(0)
+            return res_vec if norm is None else np.linalg.norm(res_vec, norm)
+        # accumulate into the first block's array rather than summing a list of arrays
+        res_vec = d.assemble_mixed(forms[0]).get_local()
+        for form in forms[1:]:
+            res_vec += d.assemble_mixed(form).get_local()
         if norm is None:
             return res_vec
         else:
@@ -2129,9 +2262,6 @@ class Model:
 
     def get_total_residual(self, norm=None):
         """returns total residual for all active compartment as given norm"""
-        res_vec = np.hstack(
-            [d.assemble_mixed(form).get_local() for form in chain.from_iterable(self.Fblocks_all)]
-        )
         res_vec = np.hstack(
             [
                 self.get_compartment_residual(compartment, norm=None)
@@ -2146,11 +2276,10 @@ class Model:
 
     def get_mesh_by_id(self, mesh_id):
         """returns mesh with id, mesh_id"""
-        for mesh in self.parent_mesh.all_meshes.values():
-            if mesh.id == mesh_id:
-                return mesh
-            else:
-                raise ValueError(f"No mesh with id {mesh_id}")
+        try:
+            return self._mesh_by_id[mesh_id]
+        except KeyError:
+            raise ValueError(f"No mesh with id {mesh_id}")
 
     # ============================================================
     # Model - Printing
@@ -2169,22 +2298,14 @@ class Model:
                 "num_facets",
                 "num_vertices",
             ]
-            df = pandas.DataFrame()
+            # collect one row per mesh and build the table once at the end
+            rows = []
 
             # parent mesh
-            tempdict = odict()
-            for key in properties_to_print:
-                tempdict[key] = getattr(self.parent_mesh, key)
-
-            tempseries = pandas.Series(tempdict, name=self.parent_mesh.name)
-            df = pandas.concat([df, tempseries.to_frame().T], ignore_index=True)
+            rows.append({key: getattr(self.parent_mesh, key) for key in properties_to_print})
             # child meshes
             for child_mesh in self.child_meshes.values():
-                tempdict = odict()
-                for key in properties_to_print:
-                    tempdict[key] = getattr(child_mesh, key)
-                tempseries = pandas.Series(tempdict, name=child_mesh.name)
-                df = pandas.concat([df, tempseries.to_frame().T], ignore_index=True)
+                rows.append({key: getattr(child_mesh, key) for key in properties_to_print})
             # intersection meshes
             for child_mesh in self.parent_mesh.child_surface_meshes:
                 for mesh_id_pair in child_mesh.intersection_map.keys():
@@ -2211,15 +2332,37 @@ class Model:
                     tempdict["num_vertices"] = child_mesh.intersection_submesh[
                         mesh_id_pair
                     ].num_vertices()
-                    tempseries = pandas.Series(tempdict, name=intersection_mesh_name)
-                    df = pandas.concat([df, tempseries.to_frame().T], ignore_index=True)
+                    rows.append(tempdict)
 
+            df = pandas.DataFrame(rows, columns=properties_to_print)
             print(tabulate(df, headers="keys", tablefmt=tablefmt))
 
+    @cached_property
+    def _time_functions(self):
+        """Numerical functions of time, keyed by sympy expression (see _lambdify_time)"""
+        return dict()
+
+    def _lambdify_time(self, expr):
+        """Numerical function of time `t` for a sympy expression (created once per
+        expression and kept for the lifetime of the model)"""
+        if expr not in self._time_functions:
+            self._time_functions[expr] = lambdify(sym.symbols("t"), expr)
+        return self._time_functions[expr]
+
     def rounded_decimal(self, x):
         """Round time value to specified decimal point"""
+        # times and time-steps are mostly already on the decimal grid, nothing to do
+        if isinstance(x, Decimal) and x.same_quantum(self._base_t):
+            return x
         return Decimal(x).quantize(self._base_t)
 
+    def _get_curvature_function(self, compartment):
+        """Interpolate the parent mesh curvature onto a compartment"""
+        scalarFunctionSpace = d.FunctionSpace(
+            self.child_meshes[compartment.name].dolfin_mesh, "P", 1
+        )
+        return self.mf0_to_fun(self.parent_mesh.curvature, scalarFunctionSpace)
+
     def mf0_to_fun(self, mf0, V):
         """
         Convert vertex mesh function over parent mesh to a dolfin function
@@ -2228,27 +2371,17 @@ class Model:
         dfunc = d.Function(V)
         mesh_ref = self.parent_mesh.dolfin_mesh
         bmesh = V.mesh()
-        store_map = bmesh.topology().mapping()[mesh_ref.id()].vertex_map()
+        store_map = np.asarray(bmesh.topology().mapping()[mesh_ref.id()].vertex_map())
+        vertex_to_dof = d.vertex_to_dof_map(V)
         values = dfunc.vector().get_local()
-        for j in range(len(store_map)):
-            cur_sub_idx = d.vertex_to_dof_map(V)[j]
-            values[cur_sub_idx] = mf0.array()[store_map[j]]
+        values[vertex_to_dof[: len(store_map)]] = mf0.array()[store_map]
         dfunc.vector().set_local(values)
         dfunc.vector().apply("insert")
         return dfunc
 
     def adjust_dt(self):
-        if self.idx_nl[-1] in [0, 1]:
-            dt_scale = 1.1
-        elif self.idx_nl[-1] in [2, 3, 4]:
-            dt_scale = 1.05
-        elif self.idx_nl[-1] in [5, 6, 7, 8, 9, 10]:
-            dt_scale = 1.0
-        # decrease time step
-        elif self.idx_nl[-1] in [11, 12, 13, 14, 15, 16, 17, 18, 19, 20]:
-            dt_scale = 0.8
-        elif self.idx_nl[-1] >= 20:
-            dt_scale = 0.5
+        # increase time step for few iterations, decrease it for many
+        dt_scale = _dt_scale(self.idx_nl[-1])
         # further adjustments depending on linear iterations
         # if self.idx_l[-1] <= 5 and dt_scale >= 1.0:
         #     dt_scale *= 1.05
@@ -2259,46 +2392,52 @@ class Model:
 
     def load_timesteps_from_xdmf(self, xdmffile):
         times = []
-        tree = ET.parse(xdmffile)
-        for elem in tree.iter():
+        # stream the file rather than building the whole tree, elements are
+        # discarded as soon as they have been visited
+        for _, elem in ET.iterparse(xdmffile, events=("end",)):
             if elem.tag == "Time":
                 times.append(float(elem.get("Value")))
+            elem.clear()
         return times
 
+    def _set_xdmf_parameter_values(self, parameter):
+        """Load the current values of a from_xdmf parameter and assign them
+        to its dolfin function (vertex ordering -> dof ordering)"""
+        vec_new = self.load_vector(parameter.h5_file, parameter.tVec)
+        mesh_map = parameter._mesh_map
+        if len(vec_new) != len(mesh_map):
+            raise ValueError(
+                f"Vector from {str(parameter.h5_file)} "
+                f"does not match function space for {parameter.name}"
+            )
+        vec = parameter.dolfin_function.vector()
+        # reorder to match dof ordering
+        vec.set_local(np.take(vec_new.get_local(), mesh_map))
+        vec.apply("insert")
+
     def load_vector(self, h5_file, tVec):
         cur_level = d.get_log_level()
         d.set_log_level(40)  # suppress warning about rank of h5 data
         with d.HDF5File(self.parent_mesh.mpi_comm, h5_file, "r") as cur_file:
-            # Find index associated with the starting time
-            has_timestamp = np.flatnonzero(np.isclose(tVec, float(self.t)))
-            if len(has_timestamp) > 0:
-                vec_new = d.Vector()
-                idx1 = has_timestamp[0]
-                cur_file.read(vec_new, f"VisualisationVector/{idx1}", True)
-            elif self.t > tVec[-1]:  # then starting after final time in the xdmf file
-                logger.warning(
-                    f"File {str(h5_file)} ends before current time {self.t}"
-                    "Using final time point in file instead."
-                )
-                vec_new = d.Vector()
-                idx1 = len(tVec) - 1
-                cur_file.read(vec_new, f"VisualisationVector/{idx1}", True)
-            elif self.t < tVec[0]:  # then starting before initial time in xdmf file
-                logger.warning(
-                    f"File {str(h5_file)} starts after current time {self.t}"
-                    "Using initial time point in file instead."
-                )
-                vec_new = d.Vector()
-                idx1 = 0
-                cur_file.read(vec_new, f"VisualisationVector/{idx1}", True)
-            else:  # then in between two times in the xdmf file
-                vec1 = d.Vector()
+            t = float(self.t)
+            idx1, idx2 = _bracketing_time_indices(tVec, t)
+            if idx1 == idx2 and not np.isclose(tVec[idx1], t):
+                if t > tVec[-1]:  # then starting after final time in the xdmf file
+                    logger.warning(
+                        f"File {str(h5_file)} ends before current time {self.t}"
+                        "Using final time point in file instead."
+                    )
+                else:  # then starting before initial time in xdmf file
+                    logger.warning(
+                        f"File {str(h5_file)} starts after current time {self.t}"
+                        "Using initial time point in file instead."
+                    )
+            vec_new = d.Vector()
+            cur_file.read(vec_new, f"VisualisationVector/{idx1}", True)
+            if idx2 != idx1:  # then in between two times in the xdmf file
                 vec2 = d.Vector()
-                idx1 = np.flatnonzero(tVec < float(self.t))[-1]
-                idx2 = np.flatnonzero(tVec > float(self.t))[0]
-                cur_file.read(vec1, f"VisualisationVector/{idx1}", True)
                 cur_file.read(vec2, f"VisualisationVector/{idx2}", True)
-                vec_new = (vec1 + vec2) / 2
+                vec_new = (vec_new + vec2) / 2
             cur_file.close()
         d.set_log_level(cur_level)  # restore log level
         return vec_new
@@ -427,6 +427,10 @@ class ObjectInstance:
             if isinstance(attr, pint.Unit):
                 setattr(self, name, unit_to_quantity(attr))
 
+    def _printable_dict(self):
+        """Attributes shown when printing or tabulating the object"""
+        return self.__dict__
+
     def get_pandas_series(
         self, properties_to_print: Optional[List[str]] = None, idx: Optional[int] = None
     ):
@@ -444,13 +448,13 @@ class ObjectInstance:
                 odict(
                     [
                         (key, val)
-                        for (key, val) in self.__dict__.items()
+                        for (key, val) in self._printable_dict().items()
                         if key in properties_to_print
                     ]
                 )
             )
         else:
-            dict_to_convert = self.__dict__
+            dict_to_convert = self._printable_dict()
         return pandas.Series(dict_to_convert, name=self.name)
 
     def print(self, properties_to_print=None):
@@ -462,12 +466,12 @@ class ObjectInstance:
                 dict_to_print = dict(
                     [
                         (key, val)
-                        for (key, val) in self.__dict__.items()
+                        for (key, val) in self._printable_dict().items()
                         if key in properties_to_print
                     ]
                 )
             else:
-                dict_to_print = self.__dict__
+                dict_to_print = self._printable_dict()
                 logger.info(pformat(dict_to_print, width=240))
 
 
@@ -844,6 +848,50 @@ class Parameter(ObjectInstance):
         self.check_validity()
         self.value_vector = np.array([0, self.value])
 
+    @property
+    def value_vector(self):
+        """History of (time, value) pairs. A single pair until the parameter has been
+        updated in time, then an array with one row per update. The returned array is a
+        view of the stored history, so in-place writes persist"""
+        if self._num_values == 1:
+            return self._value_buffer[0]
+        return self._value_buffer[: self._num_values]
+
+    @value_vector.setter
+    def value_vector(self, value_vector):
+        self._value_buffer = np.array(np.atleast_2d(value_vector), dtype=np.float64)
+        self._num_values = self._value_buffer.shape[0]
+
+    def _printable_dict(self):
+        """Attributes shown when printing or tabulating the parameter, with the value
+        history as value_vector rather than its storage buffer"""
+        printable = {
+            key: val
+            for key, val in self.__dict__.items()
+            if key not in ("_value_buffer", "_num_values")
+        }
+        printable["value_vector"] = self.value_vector
+        return printable
+
+    def append_value(self, t, value):
+        """Record the value of the parameter at time t"""
+        if self._num_values == self._value_buffer.shape[0]:
+            # double the capacity so appending is amortized constant time
+            self._value_buffer = np.resize(self._value_buffer, (2 * self._num_values, 2))
+        self._value_buffer[self._num_values] = (t, value)
+        self._num_values += 1
+
+    @cached_property
+    def _sampling_columns(self):
+        """Contiguous (time, value) columns of sampling_data, so that interpolating
+        in time does not copy the strided columns on every call"""
+        return tuple(np.ascontiguousarray(column) for column in self.sampling_data.T)
+
+    @cached_property
+    def _preint_sampling_columns(self):
+        """Contiguous (time, integral) columns of preint_sampling_data"""
+        return tuple(np.ascontiguousarray(column) for column in self.preint_sampling_data.T)
+
     @property
     def dolfin_quantity(self):
         if self.type == ParameterType.from_xdmf:
@@ -975,6 +1023,7 @@ class Species(ObjectInstance):
         self.is_in_a_reaction = False
         self.is_an_added_species = False
         self.dof_map = None
+        self._vertex_map = None
         self.u = dict()
         self._usplit = dict()
         self.ut = None
@@ -1120,6 +1169,22 @@ class CompartmentContainer(ObjectContainer):
             c.num_cells
         super().print(tablefmt, self.properties_to_print, filename, max_col_width)
 
+    def get_dims_and_markers(self):
+        """Return the compartment dimensionalities and cell markers as numpy arrays
+        (compartments with a list of markers contribute every marker)"""
+        dims = np.fromiter((c.dimensionality for c in self), dtype=np.int8, count=self.size)
+        markers = np.array(
+            [
+                marker
+                for c in self
+                for marker in (
+                    c.cell_marker if isinstance(c.cell_marker, list) else [c.cell_marker]
+                )
+            ],
+            dtype=np.int64,
+        )
+        return dims, markers
+
 
 @dataclass
 class Compartment(ObjectInstance):
@@ -1170,6 +1235,8 @@ class Compartment(ObjectInstance):
         self._usplit = dict()
         self.V = None
         self.v = None
+        self._curv_func = None
+        self._curv_func_factory = None
 
     def check_validity(self):
         """
@@ -1204,6 +1271,24 @@ class Compartment(ObjectInstance):
     def measure_units(self):
         return self.compartment_units**self.dimensionality
 
+    @property
+    def curv_func(self):
+        """Curvature as a dolfin function on this compartment (None if no curvature
+        is defined). Created the first time it is accessed unless it has been set.
+
+        .. note::
+            Creating the function is collective in parallel, so the first access
+            must happen on every process. The model sets it during initialization
+            for compartments whose reactions or initial conditions use curvature.
+        """
+        if self._curv_func is None and self._curv_func_factory is not None:
+            self._curv_func = self._curv_func_factory()
+        return self._curv_func
+
+    @curv_func.setter
+    def curv_func(self, curv_func):
+        self._curv_func = curv_func
+
     @property
     def mesh_id(self):
         self._mesh_id = self.mesh.id
@@ -1378,6 +1463,10 @@ class Reaction(ObjectInstance):
         self._check_input_type_validity()
         self.check_validity()
         self.fluxes = dict()
+        # sympy expressions for eqn_f_str/eqn_r_str (set by _parse_equations())
+        self._eqn_f_sym = None
+        self._eqn_r_sym = None
+        self._free_symbols = set()
 
         if self.eqn_f_str != "" or self.eqn_r_str != "" and self.reaction_type == "mass_action":
             self.reaction_type = "custom"
@@ -1436,6 +1525,18 @@ class Reaction(ObjectInstance):
         reaction_expr = reaction_expr.subs(self.species_map)
         return str(reaction_expr)
 
+    def _parse_equations(self):
+        """Parse the forward/reverse equation strings once and cache the
+        sympy expressions and the names of their free symbols"""
+        self._eqn_f_sym = parse_expr(self.eqn_f_str) if self.eqn_f_str else None
+        self._eqn_r_sym = parse_expr(self.eqn_r_str) if self.eqn_r_str else None
+        self._free_symbols = {
+            str(x)
+            for eqn in (self._eqn_f_sym, self._eqn_r_sym)
+            if eqn is not None
+            for x in eqn.free_symbols
+        }
+
     def reaction_to_fluxes(self):
         """
         Convert reactions to fluxes -
@@ -1468,7 +1569,7 @@ class Reaction(ObjectInstance):
             species = self.species[species_name]
             if self.eqn_f_str:
                 flux_name = self.name + f" [{species_name} (f)]"
-                eqn = stoich * parse_expr(self.eqn_f_str)
+                eqn = stoich * self._eqn_f_sym
                 self.fluxes.update({flux_name: Flux(flux_name, species, eqn, self, self.axisymm)})
                 self.fluxes[flux_name].has_subdomain = self.has_subdomain
                 if self.has_subdomain:  # then copy over subdomain data to flux
@@ -1476,7 +1577,7 @@ class Reaction(ObjectInstance):
                     self.fluxes[flux_name].subdomain_val = self.subdomain_val
             if self.eqn_r_str:
                 flux_name = self.name + f" [{species_name} (r)]"
-                eqn = -stoich * parse_expr(self.eqn_r_str)
+                eqn = -stoich * self._eqn_r_sym
                 self.fluxes.update({flux_name: Flux(flux_name, species, eqn, self, self.axisymm)})
                 if self.has_subdomain:  # then copy over subdomain data to flux
                     self.fluxes[flux_name].subdomain_data = self.subdomain_data
@@ -1546,6 +1647,8 @@ class Flux(ObjectInstance):
         # Add in an uninitialized unit_scale_factor
         self.unit_scale_factor = 1.0 * unit.dimensionless
         self.equation = self.equation * Symbol("unit_scale_factor")
+        # the equation is fixed from here on, so only collect its variable names once
+        self._equation_symbol_names = {str(x) for x in self.equation.free_symbols}
 
         # Getting additional flux properties
         self._post_init_get_involved_species_parameters_compartments()
@@ -1571,7 +1674,7 @@ class Flux(ObjectInstance):
         self.destination_compartment = self.destination_species.compartment
 
         # Get the subset of species/parameters/compartments that are relevant
-        variables = {str(x) for x in self.equation.free_symbols}
+        variables = self._equation_symbol_names
         all_params = self.reaction.parameters
         all_species = self.reaction.species
         self.parameters = {x: all_params[x] for x in variables.intersection(all_params.keys())}
@@ -1758,8 +1861,7 @@ class Flux(ObjectInstance):
             for variable in {**self.parameters, **self.species}.values()
         }
         variables.update({"unit_scale_factor": self.unit_scale_factor})
-        free_symbols = [str(x) for x in self.equation.free_symbols]
-        if "curv" in free_symbols:
+        if "curv" in self._equation_symbol_names:
             self.curv = self.surface.curv_func / self.surface.compartment_units
             variables.update({"curv": self.curv})
         return variables
@@ -2014,19 +2116,20 @@ def create_restriction(u: d.Function, mesh_function: d.MeshFunction, value: np.i
 
     # Find all degrees of freedom to transfer data from
     V = u.function_space()
-    u_new = d.Function(u.function_space())
+    dofmap = V.dofmap()
+    u_new = d.Function(V)
     vector = u_new.vector()
-    dof_list = [V.dofmap().cell_dofs(cell) for cell in local_indices]
+    dof_list = [dofmap.cell_dofs(cell) for cell in local_indices]
     if len(dof_list) == 0:
-        transfer_dofs = np.array([])
+        transfer_dofs = np.array([], dtype=np.intc)
     else:
-        transfer_dofs = np.unique(np.hstack(dof_list))
-    im = V.dofmap().index_map()
+        transfer_dofs = np.unique(np.concatenate(dof_list)).astype(np.intc)
+    im = dofmap.index_map()
     num_local = im.local_range()[1] - im.local_range()[0]
 
-    # Filter out dofs that are not local
-    transfer_dofs = np.array([dof for dof in transfer_dofs if dof < num_local])
-    vector[transfer_dofs] = u.vector()[transfer_dofs]
+    # Filter out dofs that are not local (np.unique returns them sorted)
+    transfer_dofs = transfer_dofs[: np.searchsorted(transfer_dofs, num_local)]
+    vector.set_local(u.vector().get_local(transfer_dofs), transfer_dofs)
     vector.apply("insert")
 
     return u_new
@@ -58,3 +58,68 @@ def parameter_kwargs_k3f():
         notes="Some notes",
         use_preintegration=True,
     )
+
+
+@pytest.fixture(scope="session")
+def cube_mesh_file(tmp_path_factory):
+    mesh, mf2, mf3 = smart.mesh_tools.create_cubes(N=4)
+    mesh_file = tmp_path_factory.mktemp("mesh") / "cubes.h5"
+    smart.mesh_tools.write_mesh(mesh, mf2, mf3, filename=mesh_file)
+    return mesh_file
+
+
+@pytest.fixture
+def cube_containers():
+    """Uncoupled decay of A in Cyto (cell marker 1) and of B on PM (facet marker 10)"""
+    D_unit = smart.units.unit.um**2 / smart.units.unit.s
+    conc_unit_vol = smart.units.unit.molecule / smart.units.unit.um**3
+    conc_unit_surf = smart.units.unit.molecule / smart.units.unit.um**2
+    cc = smart.model_assembly.CompartmentContainer()
+    cc.add(
+        [
+            smart.model_assembly.Compartment("Cyto", 3, smart.units.unit.um, 1),
+            smart.model_assembly.Compartment("PM", 2, smart.units.unit.um, 10),
+        ]
+    )
+    sc = smart.model_assembly.SpeciesContainer()
+    sc.add(
+        [
+            smart.model_assembly.Species("A", 10, conc_unit_vol, 1.0, D_unit, "Cyto"),
+            smart.model_assembly.Species("B", 10, conc_unit_surf, 1.0, D_unit, "PM"),
+        ]
+    )
+    pc = smart.model_assembly.ParameterContainer()
+    pc.add(
+        [
+            smart.model_assembly.Parameter("kA", 1.0, 1 / smart.units.unit.s),
+            smart.model_assembly.Parameter("kB", 2.0, 1 / smart.units.unit.s),
+        ]
+    )
+    rc = smart.model_assembly.ReactionContainer()
+    rc.add(
+        [
+            smart.model_assembly.Reaction(
+                "rA", ["A"], [], param_map={"k": "kA"}, species_map={"sp": "A"}, eqn_f_str="k*sp"
+            ),
+            smart.model_assembly.Reaction(
+                "rB", ["B"], [], param_map={"k": "kB"}, species_map={"sp": "B"}, eqn_f_str="k*sp"
+            ),
+        ]
+    )
+    return pc, sc, cc, rc
+
+
+@pytest.fixture
+def create_model(cube_mesh_file):
+    """Factory building a model on the cube mesh from (pc, sc, cc, rc)"""
+
+    def _create_model(pc, sc, cc, rc, flags=None, **solver_settings):
+        parent_mesh = smart.mesh.ParentMesh(
+            mesh_filename=str(cube_mesh_file), mesh_filetype="hdf5", name="parent_mesh"
+        )
+        config = smart.config.Config()
+        config.solver.update({"final_t": 0.1, "initial_dt": 0.05, **solver_settings})
+        config.flags.update({"print_verbose_info": False, **(flags or {})})
+        return smart.model.Model(pc, sc, cc, rc, config, parent_mesh)
+
+    return _create_model
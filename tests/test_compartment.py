@@ -31,3 +31,18 @@ def test_CompartmentContainer(compartment_kwargs_Cyto, compartment_kwargs_PM):
     cc.add([PM])
     assert cc.size == 2
     assert set(cc.keys) == {"Cyto", "PM"}
+
+
+def test_CompartmentContainer_get_dims_and_markers(compartment_kwargs_Cyto, compartment_kwargs_PM):
+    """Dimensionalities and markers reflect the compartments currently in the container"""
+    cc = smart.model_assembly.CompartmentContainer()
+    cc.add([smart.model_assembly.Compartment(**compartment_kwargs_Cyto)])
+    dims, markers = cc.get_dims_and_markers()
+    assert dims.tolist() == [3]
+    assert markers.tolist() == [1]
+
+    cc.add([smart.model_assembly.Compartment(**compartment_kwargs_PM)])
+    cc.add([smart.model_assembly.Compartment("ERM", 2, smart.units.unit.um, [12, 14])])
+    dims, markers = cc.get_dims_and_markers()
+    assert dims.tolist() == [3, 2, 2]
+    assert markers.tolist() == [1, 10, 12, 14]
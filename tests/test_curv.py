@@ -1,6 +1,9 @@
+import dolfin
 from smart import mesh_tools
 import numpy as np
 
+import smart
+
 
 def test_circle_curv():
     """Test calculation of curvature for unit circle"""
@@ -62,3 +65,41 @@ def test_axisymm_curv():
         f"Maximum error in axisymmetric curvature is {max(half_error)}%",
         f" and mean value is {np.average(curv_half_vec)}",
     )
+
+
+def test_model_curv_func(cube_containers, create_model):
+    """Curvature is created during initialization for compartments whose reactions
+    depend on it, and lazily on first access for all other compartments"""
+    pc, sc, cc, rc = cube_containers
+    pc.remove("kB")
+    pc.add([smart.model_assembly.Parameter("kB", 2.0, smart.units.unit.um / smart.units.unit.s)])
+    rc.remove("rB")
+    rc.add(
+        [
+            smart.model_assembly.Reaction(
+                "rB",
+                ["B"],
+                [],
+                param_map={"k": "kB"},
+                species_map={"sp": "B"},
+                eqn_f_str="k*curv*sp",
+            )
+        ]
+    )
+    model = create_model(pc, sc, cc, rc)
+    model.parent_mesh.curvature = dolfin.MeshFunction(
+        "double", model.parent_mesh.dolfin_mesh, 0, 1.0
+    )
+    model.initialize()
+
+    PM, Cyto = cc["PM"], cc["Cyto"]
+    assert PM._curv_func is not None
+    assert np.allclose(PM.curv_func.vector().get_local(), 1.0)
+
+    assert Cyto._curv_func is None
+    curv_func = Cyto.curv_func
+    assert np.allclose(curv_func.vector().get_local(), 1.0)
+    assert Cyto.curv_func is curv_func
+
+    Cyto.curv_func = PM.curv_func
+    assert Cyto.curv_func is PM.curv_func
@@ -0,0 +1,220 @@
+import math
+from copy import deepcopy
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import smart
+
+
+def test_form_compiler_parameters_reach_forms(cube_containers, create_model, monkeypatch):
+    """Each compiled form receives its own copy of the configured form compiler parameters"""
+    fc_parameters = {"quadrature_degree": 2}
+    model = create_model(*cube_containers, form_compiler_parameters=fc_parameters)
+
+    dolfin_form = smart.model.d.Form
+    received = []
+
+    def recording_form(*args, **kwargs):
+        received.append(deepcopy(kwargs.get("form_compiler_parameters")))
+        return dolfin_form(*args, **kwargs)
+
+    monkeypatch.setattr(smart.model.d, "Form", recording_form)
+    model.initialize()
+
+    assert len(received) > 0
+    assert all(parameters == fc_parameters for parameters in received)
+    assert model.config.solver.form_compiler_parameters == {"quadrature_degree": 2}
+
+
+def test_get_mesh_by_id(cube_containers, create_model):
+    """Every parent and child mesh resolves from its id, unknown ids raise"""
+    model = create_model(*cube_containers)
+    model.initialize()
+
+    meshes = model.parent_mesh.all_meshes.values()
+    assert len(meshes) == 3
+    for mesh in meshes:
+        assert model.get_mesh_by_id(mesh.id) is mesh
+
+    unknown_id = max(mesh.id for mesh in meshes) + 1
+    with pytest.raises(ValueError):
+        model.get_mesh_by_id(unknown_id)
+
+
+def test_uncoupled_compartments_have_empty_jacobian_blocks(cube_containers, create_model):
+    """Off-diagonal Jacobian blocks of compartments that do not couple are left empty
+    and the block system still solves"""
+    model = create_model(*cube_containers)
+    model.initialize()
+
+    u = model.u["u"]._functions
+    assert len(u) == 2
+    Fblocks = model._extract_blocks(model.Fsum_all)
+    for i, Fi in enumerate(Fblocks):
+        Fi_coefficients = set(Fi.coefficients())
+        for j, uj in enumerate(u):
+            Jij = model.Jblocks_all[i * len(u) + j]
+            if i == j:
+                assert uj in Fi_coefficients
+                assert all(isinstance(Jsub, smart.model.d.Form) for Jsub in Jij)
+            else:
+                assert uj not in Fi_coefficients
+                assert len(Jij) == 1 and not isinstance(Jij[0], smart.model.d.Form)
+
+    model.monolithic_solve()
+    assert model.solver.getConvergedReason() > 0
+
+
+@pytest.mark.parametrize("allow_unused_components", [True, False])
+def test_unused_components(cube_containers, create_model, allow_unused_components):
+    """Unused parameters, species and compartments are removed if allowed, otherwise
+    initialization fails"""
+    pc, sc, cc, rc = cube_containers
+    conc_unit = smart.units.unit.molecule / smart.units.unit.um**3
+    D_unit = smart.units.unit.um**2 / smart.units.unit.s
+    pc.add([smart.model_assembly.Parameter("kU", 1.0, 1 / smart.units.unit.s)])
+    sc.add([smart.model_assembly.Species("C", 10, conc_unit, 1.0, D_unit, "ER")])
+    cc.add([smart.model_assembly.Compartment("ER", 3, smart.units.unit.um, 2)])
+    model = create_model(pc, sc, cc, rc, flags={"allow_unused_components": allow_unused_components})
+
+    if allow_unused_components:
+        model.initialize()
+        assert set(pc.keys) == {"kA", "kB"}
+        assert set(sc.keys) == {"A", "B"}
+        assert set(cc.keys) == {"Cyto", "PM"}
+    else:
+        with pytest.raises(ValueError, match="unused"):
+            model.initialize()
+
+
+def test_duplicate_compartment_markers(cube_containers, create_model):
+    """Two compartments sharing a marker are rejected during initialization"""
+    pc, sc, cc, rc = cube_containers
+    cc.add([smart.model_assembly.Compartment("ER", 3, smart.units.unit.um, 1)])
+    model = create_model(pc, sc, cc, rc)
+    with pytest.raises(ValueError, match="same marker"):
+        model.initialize()
+
+
+def test_duplicate_marker_added_after_dimensionality_check(cube_containers, create_model):
+    """The marker check sees compartments added after the dimensionality check"""
+    pc, sc, cc, rc = cube_containers
+    model = create_model(pc, sc, cc, rc)
+    model._init_1_1_check_mesh_dimensionality()
+    cc.add([smart.model_assembly.Compartment("ER", 3, smart.units.unit.um, 10)])
+    with pytest.raises(ValueError, match="same marker"):
+        model._init_1_2_check_namespace_conflicts()
+
+
+def test_parameters_with_identical_expressions(cube_containers, create_model):
+    """Parameters sharing an expression both take the right value after a time step"""
+    pc, sc, cc, rc = cube_containers
+    for name in ("kA", "kB"):
+        pc.remove(name)
+        pc.add(
+            [smart.model_assembly.Parameter.from_expression(name, "1 + t", 1 / smart.units.unit.s)]
+        )
+    model = create_model(pc, sc, cc, rc)
+    model.initialize()
+
+    model.monolithic_solve()
+    t = float(model.t)
+    assert t > 0
+    for name in ("kA", "kB"):
+        parameter = pc[name]
+        assert math.isclose(parameter.value, 1 + t)
+        assert math.isclose(parameter.dolfin_expression(0.5, 0.5, 0.5), 1 + t)
+        assert np.allclose(parameter.value_vector[-1], [t, 1 + t])
+
+
+@pytest.mark.parametrize("nl_its", range(61))
+def test_dt_scale(nl_its):
+    """The time-step scaling table matches the original cascade of conditions"""
+    if nl_its in [0, 1]:
+        expected = 1.1
+    elif nl_its in [2, 3, 4]:
+        expected = 1.05
+    elif nl_its in [5, 6, 7, 8, 9, 10]:
+        expected = 1.0
+    elif nl_its in [11, 12, 13, 14, 15, 16, 17, 18, 19, 20]:
+        expected = 0.8
+    else:
+        expected = 0.5
+    assert smart.model._dt_scale(nl_its) == expected
+
+
+@pytest.mark.parametrize(
+    "x, expected",
+    [
+        (Decimal("0.123"), Decimal("0.123")),
+        (Decimal("0.12345"), Decimal("0.123")),
+        (Decimal("0.1"), Decimal("0.100")),
+        (0.1, Decimal("0.100")),
+        (2, Decimal("2.000")),
+    ],
+)
+def test_rounded_decimal(x, expected):
+    """Times are quantized to the time precision, already quantized times are returned as is"""
+    model = SimpleNamespace(_base_t=Decimal("0.001"))
+    rounded = smart.model.Model.rounded_decimal(model, x)
+    assert rounded == expected
+    assert rounded.same_quantum(model._base_t)
+    assert rounded == Decimal(x).quantize(model._base_t)
+    if isinstance(x, Decimal) and x.same_quantum(model._base_t):
+        assert rounded is x
+
+
+@pytest.mark.parametrize(
+    "t, expected",
+    [
+        (1.0, (1, 1)),
+        (1.0 + 1e-12, (1, 1)),
+        (2.0, (2, 2)),
+        (0.5, (0, 1)),
+        (1.5, (1, 2)),
+        (-1.0, (0, 0)),
+        (3.0, (2, 2)),
+    ],
+)
+def test_bracketing_time_indices(t, expected):
+    """Exact times and times outside of the file map to a single index, other times to the
+    indices on either side"""
+    tVec = np.array([0.0, 1.0, 2.0])
+    assert smart.model._bracketing_time_indices(tVec, t) == expected
+
+
+def test_space_dependent_preintegrated_parameter(cube_containers, create_model):
+    """The pre-integrated expression of a space-dependent parameter is built once and
+    evaluates to (F(t) - F(tn))/dt after every step, also when dt changes"""
+    pc, sc, cc, rc = cube_containers
+    pc.remove("kA")
+    pc.add(
+        [
+            smart.model_assembly.Parameter.from_expression(
+                "kA",
+                "(1 + x)*(1 + 2*t)",
+                1 / smart.units.unit.s,
+                use_preintegration=True,
+                preint_sym_expr="(1 + x)*(t + t**2)",
+            )
+        ]
+    )
+    model = create_model(pc, sc, cc, rc)
+    model.initialize()
+    expression = pc["kA"].dolfin_expression
+
+    def preint(x, t):
+        return (1 + x) * (t + t**2)
+
+    for dt in (None, 0.02):
+        if dt is not None:
+            model.set_dt(dt)
+        model.monolithic_solve()
+        t, tn, dt = float(model.t), float(model.tn), float(model.dt)
+        assert pc["kA"].dolfin_expression is expression
+        for x in (0.0, 0.5, 1.0):
+            expected = (preint(x, t) - preint(x, tn)) / dt
+            assert math.isclose(expression(x, 0.5, 0.5), expected)
@@ -54,6 +54,51 @@ def test_Parameter_from_expression(use_preintegration):
     assert j1pulse.is_time_dependent is True
 
 
+def test_Parameter_append_value(parameter_kwargs_k3f):
+    """Appending values grows the single (t, value) pair into one row per time"""
+    k3f = smart.model_assembly.Parameter(**parameter_kwargs_k3f)
+    value = parameter_kwargs_k3f["value"]
+    assert k3f.value_vector.shape == (2,)
+
+    k3f.append_value(0.1, 2.5)
+    assert np.allclose(k3f.value_vector, [[0.0, value], [0.1, 2.5]])
+
+    for i in range(2, 10):
+        k3f.append_value(0.1 * i, value + i)
+    assert k3f.value_vector.shape == (10, 2)
+    assert np.allclose(k3f.value_vector[:, 0], 0.1 * np.arange(10))
+    assert np.allclose(k3f.value_vector[2:, 1], value + np.arange(2, 10))
+
+    # the returned array is a view of the history, in-place writes persist
+    k3f.value_vector[-1, 1] = -1.0
+    assert math.isclose(k3f.value_vector[-1, 1], -1.0)
+
+
+def test_Parameter_value_vector_setter(parameter_kwargs_k3f):
+    """The setter accepts a single pair or an array of pairs and does not truncate integers"""
+    k3f = smart.model_assembly.Parameter(**parameter_kwargs_k3f)
+
+    k3f.value_vector = [0, 3]
+    assert k3f.value_vector.shape == (2,)
+    k3f.append_value(0.5, 1.5)
+    assert np.allclose(k3f.value_vector, [[0.0, 3.0], [0.5, 1.5]])
+
+    k3f.value_vector = np.array([[0.0, 1.0], [1.0, 2.0], [2.0, 4.0]])
+    assert k3f.value_vector.shape == (3, 2)
+    k3f.append_value(3.0, 8.0)
+    assert np.allclose(k3f.value_vector[:, 1], [1.0, 2.0, 4.0, 8.0])
+
+
+def test_Parameter_printing_hides_value_buffer(parameter_kwargs_k3f):
+    """Printing shows the value history as value_vector, not its storage buffer"""
+    k3f = smart.model_assembly.Parameter(**parameter_kwargs_k3f)
+    k3f.append_value(0.1, 2.5)
+    series = k3f.get_pandas_series()
+    assert "_value_buffer" not in series.index
+    assert "_num_values" not in series.index
+    assert np.allclose(series["value_vector"], k3f.value_vector)
+
+
 def test_ParameterContainer(parameter_kwargs_k3f):
     """Test that we can initialize k3f SpeciesContainer"""
     k3f = smart.model_assembly.Parameter(**parameter_kwargs_k3f)